@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import os
-import subprocess
+import socket
 import sys
 from pathlib import Path
 
@@ -17,6 +17,7 @@ from tool import head, desc, info, warn, fail
 
 IDENTITY_DIR = Path("/etc/nodi-edge")
 IDENTITY_FILE = IDENTITY_DIR / "identity"
+HOSTNAME_FILE = Path("/etc/hostname")
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -58,8 +59,12 @@ info(f"serial_number={serial_number}")
 
 desc("Check Existing")
 
-if IDENTITY_FILE.exists():
+try:
     existing = IDENTITY_FILE.read_text().strip()
+except FileNotFoundError:
+    existing = None
+
+if existing is not None:
     for line in existing.split("\n"):
         if line.startswith("SERIAL_NUMBER="):
             old_serial = line.split("=", 1)[1]
@@ -89,11 +94,13 @@ info(f"{IDENTITY_DIR}")
 
 desc("Write Identity")
 
-if IDENTITY_FILE.exists():
-    os.chmod(IDENTITY_FILE, 0o644)
 identity_content = f"SERIAL_NUMBER={serial_number}\n"
-IDENTITY_FILE.write_text(identity_content)
-os.chmod(IDENTITY_FILE, 0o444)
+fd = os.open(IDENTITY_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+try:
+    os.write(fd, identity_content.encode())
+    os.fchmod(fd, 0o444)
+finally:
+    os.close(fd)
 info(f"{IDENTITY_FILE}")
 
 
@@ -103,7 +110,9 @@ info(f"{IDENTITY_FILE}")
 
 desc("Set Hostname")
 
-subprocess.run(["hostnamectl", "set-hostname", serial_number], check=True)
+# Kernel hostname via syscall, persisted for the next boot
+socket.sethostname(serial_number)
+HOSTNAME_FILE.write_text(f"{serial_number}\n")
 info(f"{serial_number}")
 
 
@@ -7,8 +7,10 @@ import getpass
 import os
 import grp
 import pwd
+import shutil
 import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 from tool import head, desc, info, warn, fail, done
@@ -25,6 +27,12 @@ DATA_DIR = Path("/home/nodi/nodi-edge-data")
 GUEST_BIN_DIR = Path("/home/guest/bin")
 SUDOERS_FILE = Path("/etc/sudoers.d/nodi-edge")
 
+# Pre-stringified forms for os.* and run() call sites
+NODI_HOME_S = f"/home/{USER_NODI}"
+GUEST_HOME_S = f"/home/{USER_GUEST}"
+GUEST_BIN_S = str(GUEST_BIN_DIR)
+SUDOERS_S = str(SUDOERS_FILE)
+
 GUEST_ALLOWED_COMMANDS = [
     "/usr/bin/ping",
     "/usr/bin/ip",
@@ -49,8 +57,19 @@ GUEST_ALLOWED_COMMANDS = [
 # Helper Functions
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def run(cmd: list[str], check: bool = True) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, check=check, capture_output=True, text=True)
+@lru_cache(maxsize=None)
+def which(name: str) -> str:
+    # Absolute executable lets subprocess take the vfork/posix_spawn fast path
+    return shutil.which(name) or name
+
+
+def run(cmd: list[str],
+        check: bool = True,
+        capture: bool = False) -> subprocess.CompletedProcess:
+    # Only open pipes when the caller reads the output
+    stream = subprocess.PIPE if capture else subprocess.DEVNULL
+    return subprocess.run(cmd, executable=which(cmd[0]), check=check,
+                          stdout=stream, stderr=stream, text=capture)
 
 
 def user_exists(username: str) -> bool:
@@ -71,17 +90,34 @@ def prompt_password(username: str) -> str:
 
 
 def set_password(username: str, password: str) -> None:
-    proc = subprocess.Popen(["chpasswd"],
-                            stdin=subprocess.PIPE,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE)
-    proc.communicate(input=f"{username}:{password}".encode())
-
-
-def chown_recursive(path: Path, uid: int, gid: int) -> None:
-    os.chown(path, uid, gid)
-    for child in path.rglob("*"):
-        os.chown(child, uid, gid)
+    subprocess.run(["chpasswd"],
+                   executable=which("chpasswd"),
+                   input=f"{username}:{password}".encode(),
+                   stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL,
+                   check=True)
+
+
+def write_immutable(path: str, text: str) -> None:
+    # Unlock, overwrite and relock in one shell instead of three steps
+    subprocess.run(["bash", "-c",
+                    'chattr -i "$1" 2>/dev/null; cat >"$1" || exit; chattr +i "$1" 2>/dev/null || :',
+                    "_", path],
+                   executable=which("bash"),
+                   input=text.encode(),
+                   stdout=subprocess.DEVNULL,
+                   check=True)
+
+
+def chown_recursive(path: str, uid: int, gid: int) -> None:
+    # Resolve entries relative to each directory fd (no full path walk per entry)
+    chown = os.chown
+    for _root, dirs, files, root_fd in os.fwalk(path):
+        chown(root_fd, uid, gid)
+        for name in dirs:
+            chown(name, uid, gid, dir_fd=root_fd, follow_symlinks=False)
+        for name in files:
+            chown(name, uid, gid, dir_fd=root_fd, follow_symlinks=False)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -127,9 +163,8 @@ else:
 
 desc("Restrict Nodi Home")
 
-nodi_home = Path(f"/home/{USER_NODI}")
-run(["chmod", "750", str(nodi_home)])
-info(f"{nodi_home} (750)")
+os.chmod(NODI_HOME_S, 0o750)
+info(f"{NODI_HOME_S} (750)")
 
 
 # ────────────────────────────────────────────────────────────
@@ -154,25 +189,30 @@ else:
 
 desc("Setup Guest Commands")
 
-GUEST_BIN_DIR.mkdir(parents=True, exist_ok=True)
+os.makedirs(GUEST_BIN_S, exist_ok=True)
 
 # Clear old symlinks
-for existing in GUEST_BIN_DIR.iterdir():
-    if existing.is_symlink():
-        existing.unlink()
-
-# Link allowed commands
-linked_count = 0
+with os.scandir(GUEST_BIN_S) as entries:
+    for entry in entries:
+        if entry.is_symlink():
+            os.unlink(entry.path)
+
+# Link allowed commands (one directory read instead of a stat per command)
+cmd_dirs = {os.path.dirname(cmd_path) for cmd_path in GUEST_ALLOWED_COMMANDS}
+available = frozenset(f"{cmd_dir}/{name}"
+                      for cmd_dir in cmd_dirs
+                      for name in os.listdir(cmd_dir))
+
+linkable = [cmd_path for cmd_path in GUEST_ALLOWED_COMMANDS if cmd_path in available]
 for cmd_path in GUEST_ALLOWED_COMMANDS:
-    cmd = Path(cmd_path)
-    if cmd.exists():
-        link_path = GUEST_BIN_DIR / cmd.name
-        link_path.symlink_to(cmd)
-        linked_count += 1
-    else:
+    if cmd_path not in available:
         warn(f"{cmd_path} not found.")
 
-info(f"{linked_count} commands linked.")
+# One ln process creates every link
+if linkable:
+    run(["ln", "-sft", GUEST_BIN_S, "--", *linkable])
+
+info(f"{len(linkable)} commands linked.")
 
 
 # ────────────────────────────────────────────────────────────
@@ -181,17 +221,11 @@ info(f"{linked_count} commands linked.")
 
 desc("Configure Guest Bashrc")
 
-bashrc_path = Path(f"/home/{USER_GUEST}/.bashrc")
-
-# Unlock if immutable
-run(["chattr", "-i", str(bashrc_path)], check=False)
-
-# Overwrite with restricted PATH
-bashrc_path.write_text(f"export PATH={GUEST_BIN_DIR}\n")
-info(f"{bashrc_path}")
+bashrc_path = f"{GUEST_HOME_S}/.bashrc"
 
-# Lock bashrc
-run(["chattr", "+i", str(bashrc_path)], check=False)
+# Overwrite with restricted PATH and lock (immutable)
+write_immutable(bashrc_path, f"export PATH={GUEST_BIN_S}\n")
+info(bashrc_path)
 info("Locked (immutable).")
 
 
@@ -201,10 +235,9 @@ info("Locked (immutable).")
 
 desc("Restrict Guest Home")
 
-guest_home = Path(f"/home/{USER_GUEST}")
-run(["chown", "root:root", str(guest_home)])
-run(["chmod", "755", str(guest_home)])
-info(f"{guest_home} (755, root:root)")
+os.chown(GUEST_HOME_S, 0, 0)
+os.chmod(GUEST_HOME_S, 0o755)
+info(f"{GUEST_HOME_S} (755, root:root)")
 
 
 # ────────────────────────────────────────────────────────────
@@ -223,9 +256,10 @@ dirs = [
     DATA_DIR / "log",
 ]
 
-for d in dirs:
-    d.mkdir(parents=True, exist_ok=True)
-    info(f"{d}")
+# Shortest paths first so each makedirs finds its parent already created
+for d in sorted({str(d) for d in dirs}, key=len):
+    os.makedirs(d, exist_ok=True)
+    info(d)
 
 
 # ────────────────────────────────────────────────────────────
@@ -236,7 +270,7 @@ desc("Set Data Ownership")
 
 uid = pwd.getpwnam(USER_NODI).pw_uid
 gid = grp.getgrnam(USER_NODI).gr_gid
-chown_recursive(DATA_DIR, uid, gid)
+chown_recursive(str(DATA_DIR), uid, gid)
 info(f"{DATA_DIR} -> {USER_NODI}:{USER_NODI}")
 
 
@@ -260,8 +294,8 @@ nodi ALL=(root) NOPASSWD: /usr/bin/journalctl -u ne-*
 """
 
 SUDOERS_FILE.write_text(sudoers_content)
-run(["chmod", "440", str(SUDOERS_FILE)])
-info(f"{SUDOERS_FILE}")
+os.chmod(SUDOERS_S, 0o440)
+info(SUDOERS_S)
 
 
 # ────────────────────────────────────────────────────────────
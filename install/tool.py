@@ -3,17 +3,29 @@
 """Installer utility functions."""
 from __future__ import annotations
 
+import sys
+from functools import lru_cache
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Colors
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-RESET = '\033[0m'
-BOLD = '\033[1m'
-CYAN = '\033[36m'
-YELLOW = '\033[33m'
-RED = '\033[31m'
-GREEN = '\033[32m'
+_COLOR = sys.stdout.isatty()  # no escape codes when piped to a log
+
+RESET = '\033[0m' if _COLOR else ''
+BOLD = '\033[1m' if _COLOR else ''
+CYAN = '\033[36m' if _COLOR else ''
+YELLOW = '\033[33m' if _COLOR else ''
+RED = '\033[31m' if _COLOR else ''
+GREEN = '\033[32m' if _COLOR else ''
+
+_INFO_PREFIX = '  [INFO] '
+_WARN_PREFIX = f'  {YELLOW}[WARN]{RESET} '
+_FAIL_PREFIX = f'  {RED}[FAIL]{RESET} '
+_DONE_PREFIX = f'  {GREEN}[DONE]{RESET} '
+
+_write = sys.stdout.write
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -39,19 +51,19 @@ def desc(text: str) -> None:
 
 
 def info(text: str) -> None:
-    print(f'  [INFO] {text}')
+    _write(f'{_INFO_PREFIX}{text}\n')
 
 
 def warn(text: str) -> None:
-    print(f'  {YELLOW}[WARN]{RESET} {text}')
+    _write(f'{_WARN_PREFIX}{text}\n')
 
 
 def fail(text: str) -> None:
-    print(f'  {RED}[FAIL]{RESET} {text}')
+    _write(f'{_FAIL_PREFIX}{text}\n')
 
 
 def done(text: str) -> None:
-    print(f'  {GREEN}[DONE]{RESET} {text}')
+    _write(f'{_DONE_PREFIX}{text}\n')
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -61,15 +73,23 @@ def done(text: str) -> None:
 IDENTITY_FILE = "/etc/nodi/identity"
 
 
+@lru_cache(maxsize=None)
+def _load_identity() -> dict[str, str]:
+    try:
+        with open(IDENTITY_FILE) as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return {}
+    identity = {}
+    for line in lines:
+        if "=" in line:
+            key, value = line.split("=", 1)
+            identity[key] = value.strip()
+    return identity
+
+
 def get_identity(key: str) -> str | None:
-    import os
-    if not os.path.exists(IDENTITY_FILE):
-        return None
-    with open(IDENTITY_FILE) as f:
-        for line in f:
-            if line.startswith(f"{key}="):
-                return line.split("=", 1)[1].strip()
-    return None
+    return _load_identity().get(key)
 
 
 def get_serial_number() -> str | None:
@@ -4,28 +4,36 @@ from __future__ import annotations
 
 __version__ = "0.1.0"
 
-from nodi_libs.logger import LoggerConfig, LoggingLevel
-
-from nodi_edge.states import AppState
-from nodi_edge.app import (
-    App,
-    AppConfig,
-    AppStatistics,
-    LoggingFlags,
-    MovingAverage,
-    StageStatistics,
-)
-from nodi_edge.interface_app import InterfaceApp
-
-__all__ = [
-    "App",
-    "AppConfig",
-    "AppStatistics",
-    "AppState",
-    "InterfaceApp",
-    "LoggerConfig",
-    "LoggingFlags",
-    "LoggingLevel",
-    "MovingAverage",
-    "StageStatistics",
-]
+from importlib import import_module
+from typing import Any, Dict, List, Tuple
+
+# Public name → (module, attribute), imported on first access (PEP 562);
+# this table is the single source for __all__
+_LAZY_ATTRS: Dict[str, Tuple[str, str]] = {
+    "App": ("nodi_edge.app", "App"),
+    "AppConfig": ("nodi_edge.app", "AppConfig"),
+    "AppStatistics": ("nodi_edge.app", "AppStatistics"),
+    "AppState": ("nodi_edge.states", "AppState"),
+    "InterfaceApp": ("nodi_edge.interface_app", "InterfaceApp"),
+    "LoggerConfig": ("nodi_libs.logger", "LoggerConfig"),
+    "LoggingFlags": ("nodi_edge.app", "LoggingFlags"),
+    "LoggingLevel": ("nodi_libs.logger", "LoggingLevel"),
+    "MovingAverage": ("nodi_edge.app", "MovingAverage"),
+    "StageStatistics": ("nodi_edge.app", "StageStatistics"),
+}
+
+__all__ = tuple(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
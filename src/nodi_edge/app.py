@@ -1,17 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import argparse
+import array
+import logging
 import os
 import signal
 import sys
 import threading
 import time
-from collections import deque
 from dataclasses import dataclass, field
 from traceback import format_exc
-from contextlib import contextmanager
-from typing import Deque, Generator, Optional
+from typing import Any, Callable, Dict, Optional
 
 from tagbus import TagBus, TagBusConfig
 from nodi_libs.fsm import FiniteStateMachine
@@ -26,13 +25,19 @@ from nodi_edge.states import AppState
 
 _DEFAULT_DOMAIN_ID = "default"
 _DATA_DIR = "/home/nodi/nodi-edge-data"
+_ABS_TIMER_MAX_INTERVAL_S = 0.05
+_TIMER_ABSTIME = 1
+_EINTR = 4
+
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Configs
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class AppConfig:
     execute_interval_s: float = 1.0
     manage_interval_s: float = 1.0
@@ -41,11 +46,16 @@ class AppConfig:
     exception_limit: int = 1
     maf_size: int = 60
     time_decimal: int = 6
+    measure_execute: bool = True
     suppress_stdout: bool = False
     process_title: str = "ne-{app_id}"
+    # Drive the manage loop from a process-wide ITIMER_REAL/SIGALRM (opt-in: the
+    # periodic SIGALRM can interrupt blocking calls in other threads and takes
+    # over signal.alarm for the whole process)
+    manage_itimer: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class LoggingFlags:
     stages: bool = True
     fallback: bool = True
@@ -60,6 +70,13 @@ class AppLoggerConfig(LoggerConfig):
     logging_flags: LoggingFlags = field(default_factory=LoggingFlags)
 
 
+@dataclass(**_DATACLASS_SLOTS)
+class _CliArgs:
+    conn_id: Optional[str] = None
+    clean: bool = False
+    debug: bool = False
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Utils
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -69,16 +86,93 @@ class MovingAverage:
     def __init__(self, size: int = 10, decimal: int = 4):
         self.size = size
         self.decimal = decimal
-        self._samples: Deque[float] = deque()
+        # Preallocated ring buffer (no per-sample allocation)
+        self._buf = array.array("d", bytes(8 * size))
+        self._idx: int = 0
+        self._count: int = 0
         self._sum: float = 0.0
-        self.mean: float = 0.0
 
     def add(self, sample: float) -> None:
-        self._samples.append(sample)
-        self._sum += sample
-        if len(self._samples) > self.size:
-            self._sum -= self._samples.popleft()
-        self.mean = round(self._sum / len(self._samples), self.decimal)
+        idx = self._idx
+        self._sum += sample - self._buf[idx]
+        self._buf[idx] = sample
+        idx += 1
+        self._idx = 0 if idx == self.size else idx
+        if self._count < self.size:
+            self._count += 1
+
+    @property
+    def mean(self) -> float:
+        # Rounded on read only (written every cycle, read rarely)
+        if not self._count:
+            return 0.0
+        return round(self._sum / self._count, self.decimal)
+
+
+def _load_clock_nanosleep() -> Optional[Callable[[int], None]]:
+    # libc clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME) via ctypes
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        clock_nanosleep = libc.clock_nanosleep
+    except (OSError, AttributeError):
+        return None
+
+    class Timespec(ctypes.Structure):
+        _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+    ts = Timespec()
+    ts_ref = ctypes.byref(ts)
+
+    def sleep_until(deadline_ns: int) -> None:
+        ts.tv_sec, ts.tv_nsec = divmod(deadline_ns, 1_000_000_000)
+        # Absolute deadline: restart after a signal without drift
+        while clock_nanosleep(time.CLOCK_MONOTONIC, _TIMER_ABSTIME, ts_ref, None) == _EINTR:
+            pass
+
+    return sleep_until
+
+
+class _AbsTimer:
+    """Periodic timer on an absolute CLOCK_MONOTONIC grid (no cumulative drift)."""
+
+    def __init__(self, interval_s: float):
+        self._period_ns = int(interval_s * 1e9)
+        self._deadline_ns: int = 0
+        # timerfd (Python 3.13+) or clock_nanosleep wake exactly on the deadline
+        self._fd: Optional[int] = None
+        self._sleep_until: Optional[Callable[[int], None]] = None
+        if hasattr(os, "timerfd_create"):
+            self._fd = os.timerfd_create(time.CLOCK_MONOTONIC, flags=os.TFD_CLOEXEC)
+        else:
+            self._sleep_until = _load_clock_nanosleep()
+        self.reset()
+
+    def reset(self) -> None:
+        self._deadline_ns = time.monotonic_ns() + self._period_ns
+
+    def wait(self) -> None:
+        deadline_ns = self._deadline_ns
+        now_ns = time.monotonic_ns()
+        if now_ns < deadline_ns:
+            if self._fd is not None:
+                os.timerfd_settime_ns(self._fd, flags=os.TFD_TIMER_ABSTIME, initial=deadline_ns)
+                os.read(self._fd, 8)
+            elif self._sleep_until is not None:
+                self._sleep_until(deadline_ns)
+            else:
+                time.sleep((deadline_ns - now_ns) / 1e9)
+            self._deadline_ns = deadline_ns + self._period_ns
+        else:
+            # Missed deadline → snap to the next grid point (no catch-up burst)
+            missed = (now_ns - deadline_ns) // self._period_ns + 1
+            self._deadline_ns = deadline_ns + missed * self._period_ns
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -86,13 +180,13 @@ class MovingAverage:
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class StageStatistics:
     elapsed_time: float = 0.0
     done: bool = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AppStatistics:
     prepare: StageStatistics = field(default_factory=StageStatistics)
     configure: StageStatistics = field(default_factory=StageStatistics)
@@ -132,8 +226,15 @@ class App:
 
         # Suppress stdout (disabled if debug mode)
         if self._app_conf.suppress_stdout and not self._cli_args.debug:
-            sys.stdout = open(os.devnull, "w")
-            sys.stderr = open(os.devnull, "w")
+            # Redirect fd 1/2 so C-level writers are silenced too
+            sys.stdout.flush()
+            sys.stderr.flush()
+            devnull_fd = os.open(os.devnull, os.O_WRONLY)
+            try:
+                os.dup2(devnull_fd, 1)
+                os.dup2(devnull_fd, 2)
+            finally:
+                os.close(devnull_fd)
 
         # Set process title
         try:
@@ -144,6 +245,7 @@ class App:
 
         # Logger
         self._logger = Logger(self._log_conf)
+        self._refresh_log_levels()
 
         # TagBus
         self._databus: Optional[TagBus] = None
@@ -154,26 +256,36 @@ class App:
             decimal=self._app_conf.time_decimal))
 
         # Timers
-        self._execute_timer = PeriodicTimer(self._app_conf.execute_interval_s)
+        execute_interval_s = self._app_conf.execute_interval_s
+        if 0 < execute_interval_s < _ABS_TIMER_MAX_INTERVAL_S:
+            self._execute_timer = _AbsTimer(execute_interval_s)
+        else:
+            self._execute_timer = PeriodicTimer(execute_interval_s)
         self._manage_timer = PeriodicTimer(self._app_conf.manage_interval_s)
         self._retry_timer = PeriodicTimer(self._app_conf.retry_delay_s)
 
         # Reconfigure
         self._reconfigure_event = threading.Event()
 
-        # FSM
+        # FSM (handler thread recorded in PREPARE, checked before closing timers)
         self._fsm = FiniteStateMachine()
+        self._fsm_thread: Optional[threading.Thread] = None
         self._setup_fsm()
 
-    def _parse_cli_args(self) -> argparse.Namespace:
-        parser = argparse.ArgumentParser(add_help=False)
-        parser.add_argument("--conn-id", type=str, default=None,
-                            help="connection identifier for config lookup")
-        parser.add_argument("--clean", action="store_true",
-                            help="clean databus state on connect")
-        parser.add_argument("--debug", action="store_true",
-                            help="enable databus debug output")
-        args, _ = parser.parse_known_args()
+    def _parse_cli_args(self) -> _CliArgs:
+        # Plain argv scan (argparse is heavy to import for three known flags; unknown args ignored)
+        args = _CliArgs()
+        argv = sys.argv[1:]
+        for idx, arg in enumerate(argv):
+            if arg == "--clean":
+                args.clean = True
+            elif arg == "--debug":
+                args.debug = True
+            elif arg == "--conn-id":
+                if idx + 1 < len(argv):
+                    args.conn_id = argv[idx + 1]
+            elif arg.startswith("--conn-id="):
+                args.conn_id = arg[len("--conn-id="):]
         return args
 
     # ────────────────────────────────────────────────────────────
@@ -219,23 +331,36 @@ class App:
     # Helpers
     # ────────────────────────────────────────────────────────────
 
-    @contextmanager
-    def _measure_time(self, stage: StageStatistics) -> Generator[None, None, None]:
-        start_time = time.perf_counter()
-        yield
-        stage.elapsed_time = round(time.perf_counter() - start_time,
-                                   self._app_conf.time_decimal)
+    def _is_log_enabled(self, level: int) -> bool:
+        # nodi_libs Logger wraps a stdlib logger; assume enabled if it is not exposed
+        inner = getattr(self._logger, "_logger", None)
+        return inner.isEnabledFor(level) if inner is not None else True
+
+    def _refresh_log_levels(self) -> None:
+        # Cached so filtered messages skip f-string and traceback formatting
+        self._debug_enabled = self._is_log_enabled(logging.DEBUG)
+        self._info_enabled = self._is_log_enabled(logging.INFO)
+        self._warning_enabled = self._is_log_enabled(logging.WARNING)
 
     def _log_fallback(self, location: str, exc: Exception) -> None:
-        if self._app_statistics.exception_count <= self._app_conf.exception_limit:
-            if self._log_conf.logging_flags.fallback:
-                self._logger.warning(f"loc: {location} | "
-                                     f"err: {exc} | "
-                                     f"cnt: {self._app_statistics.exception_count}/"
-                                     f"{self._app_conf.exception_limit}",
-                                     stacklevel=3)
-            if self._log_conf.logging_flags.traceback:
-                self._logger.debug(format_exc(), stacklevel=3)
+        # Saturated → nothing to log (flood of repeated failures)
+        exception_count = self._app_statistics.exception_count
+        exception_limit = self._app_conf.exception_limit
+        if exception_count > exception_limit:
+            return
+        logging_flags = self._log_conf.logging_flags
+        if logging_flags.fallback and self._warning_enabled:
+            self._logger.warning(f"loc: {location} | "
+                                 f"err: {exc} | "
+                                 f"cnt: {exception_count}/{exception_limit}",
+                                 stacklevel=3)
+        if logging_flags.traceback and self._debug_enabled:
+            self._logger.debug(format_exc(), stacklevel=3)
+
+    def _begin_reconfigure(self) -> None:
+        self._reconfigure_event.clear()
+        self._logger.info("reconfigure requested")
+        self._fsm.transition(AppState.CONFIGURE)
 
     def _reset_done_flags_for_retry(self) -> None:
         self._app_statistics.connect.done = False
@@ -261,55 +386,61 @@ class App:
 
         @self._fsm.state(AppState.PREPARE)
         def prepare_handler():
+            self._fsm_thread = threading.current_thread()
             try:
-                with self._measure_time(self._app_statistics.prepare):
-                    self._databus = TagBus(self._app_id, self._domain_id,
-                                            debug=self._cli_args.debug,
-                                            config=TagBusConfig(heartbeat_interval_s=1.0))
-                    self.on_prepare()
+                start_ns = time.perf_counter_ns()
+                self._databus = TagBus(self._app_id, self._domain_id,
+                                        debug=self._cli_args.debug,
+                                        config=TagBusConfig(heartbeat_interval_s=1.0))
+                self.on_prepare()
 
-                    # One-time log
-                    if not self._app_statistics.prepare.done:
-                        self._app_statistics.prepare.done = True
-                        if self._log_conf.logging_flags.stages:
-                            self._logger.info("prepared")
+                # One-time log
+                if not self._app_statistics.prepare.done:
+                    self._app_statistics.prepare.done = True
+                    if self._log_conf.logging_flags.stages:
+                        self._logger.info("prepared")
 
-                    if self._app_conf.pause_time_s > 0:
-                        time.sleep(self._app_conf.pause_time_s)
+                if self._app_conf.pause_time_s > 0:
+                    time.sleep(self._app_conf.pause_time_s)
 
-                    self._fsm.transition(AppState.CONFIGURE)
+                self._app_statistics.prepare.elapsed_time = (time.perf_counter_ns() - start_ns) * 1e-9
+
+                self._fsm.transition(AppState.CONFIGURE)
             except Exception as exc:
                 self._app_statistics.exception_count += 1
                 self._logger.error(f"prepare failed: {exc}")
-                self._logger.debug(format_exc())
+                if self._log_conf.logging_flags.traceback and self._debug_enabled:
+                    self._logger.debug(format_exc())
                 self._fsm.stop()
                 sys.exit(1)
 
         @self._fsm.state(AppState.CONFIGURE)
         def configure_handler():
             try:
-                with self._measure_time(self._app_statistics.configure):
+                start_ns = time.perf_counter_ns()
+                # Only check on first configure (reconfigure is expected with running databus)
+                if not self._app_statistics.configure.done:
+                    if self._databus and self._databus.is_running:
+                        self._logger.critical(f"app already running: {self._app_id}")
+                        self._fsm.stop()
+                        sys.exit(1)
 
-                    # Only check on first configure (reconfigure is expected with running databus)
-                    if not self._app_statistics.configure.done:
-                        if self._databus and self._databus.is_running:
-                            self._logger.critical(f"app already running: {self._app_id}")
-                            self._fsm.stop()
-                            sys.exit(1)
+                self.on_configure()
 
-                    self.on_configure()
+                # One-time log
+                if not self._app_statistics.configure.done:
+                    self._app_statistics.configure.done = True
+                    if self._log_conf.logging_flags.stages:
+                        self._logger.info("configured")
 
-                    # One-time log
-                    if not self._app_statistics.configure.done:
-                        self._app_statistics.configure.done = True
-                        if self._log_conf.logging_flags.stages:
-                            self._logger.info("configured")
+                self._app_statistics.configure.elapsed_time = (time.perf_counter_ns() - start_ns) * 1e-9
 
-                    self._fsm.transition(AppState.CONNECT)
+                self._fsm.transition(AppState.CONNECT)
             except Exception as exc:
                 self._app_statistics.exception_count += 1
                 self._logger.error(f"configure failed: {exc}")
-                self._logger.debug(format_exc())
+                if self._log_conf.logging_flags.traceback and self._debug_enabled:
+                    self._logger.debug(format_exc())
                 self._fsm.stop()
                 sys.exit(1)
 
@@ -319,21 +450,21 @@ class App:
                 self._retry_timer.wait()
 
             try:
-                with self._measure_time(self._app_statistics.connect):
-
-                    # Skip TagBus connect if already running (reconfigure path)
-                    if self._databus and not self._databus.is_running:
-                        self._databus.connect()
-                    self.on_connect()
-
-                    # One-time log
-                    if not self._app_statistics.connect.done:
-                        self._app_statistics.connect.done = True
-                        if self._log_conf.logging_flags.stages:
-                            self._logger.info("connected")
-
-                    self._execute_timer.reset()
-                    self._fsm.transition(AppState.EXECUTE)
+                start_ns = time.perf_counter_ns()
+                # Skip TagBus connect if already running (reconfigure path)
+                if self._databus and not self._databus.is_running:
+                    self._databus.connect()
+                self.on_connect()
+
+                # One-time log
+                if not self._app_statistics.connect.done:
+                    self._app_statistics.connect.done = True
+                    if self._log_conf.logging_flags.stages:
+                        self._logger.info("connected")
+
+                self._app_statistics.connect.elapsed_time = (time.perf_counter_ns() - start_ns) * 1e-9
+                self._execute_timer.reset()
+                self._fsm.transition(AppState.EXECUTE)
             except Exception as exc:
                 self._app_statistics.exception_count += 1
                 self._log_fallback("connect", exc)
@@ -341,50 +472,79 @@ class App:
 
         @self._fsm.state(AppState.EXECUTE)
         def execute_handler():
-            while self._fsm.is_running:
-                try:
-                    with self._measure_time(self._app_statistics.execute):
-                        self.on_execute()
-                        self._app_statistics.execute_maf.add(self._app_statistics.execute.elapsed_time)
-
-                        # One-time log
-                        if not self._app_statistics.execute.done:
-                            self._app_statistics.execute.done = True
-                            if self._log_conf.logging_flags.stages:
-                                self._logger.info("executing")
-                            self._reset_done_flags_for_success()
-
-                        # Check for reconfigure request
-                        if self._reconfigure_event.is_set():
-                            self._reconfigure_event.clear()
-                            self._logger.info("reconfigure requested")
-                            self._fsm.transition(AppState.CONFIGURE)
-                            break
-
-                        # Wait for next cycle
-                        self._execute_timer.wait()
-
-                except Exception as exc:
-                    self._app_statistics.exception_count += 1
-                    self._log_fallback("execute", exc)
-                    self._fsm.transition(AppState.RECOVER)
-                    break
+            # Local aliases for the per-cycle path
+            fsm = self._fsm
+            execute = self._app_statistics.execute
+            maf_add = self._app_statistics.execute_maf.add
+            on_execute = self.on_execute
+            reconfigure_requested = self._reconfigure_event.is_set
+            timer_wait = self._execute_timer.wait
+            perf_counter_ns = time.perf_counter_ns
+            measure = self._app_conf.measure_execute
+            log_stages = self._log_conf.logging_flags.stages
+
+            try:
+                # Cold path: first successful cycle after (re)connect
+                if not execute.done and fsm.is_running:
+                    if measure:
+                        start_ns = perf_counter_ns()
+                        on_execute()
+                        execute.elapsed_time = elapsed_time = (perf_counter_ns() - start_ns) * 1e-9
+                        maf_add(elapsed_time)
+                    else:
+                        on_execute()
+
+                    # One-time log
+                    execute.done = True
+                    if log_stages:
+                        self._logger.info("executing")
+                    self._reset_done_flags_for_success()
+
+                    if reconfigure_requested():
+                        self._begin_reconfigure()
+                        return
+                    timer_wait()
+
+                # Hot path: no one-time checks per cycle
+                while fsm.is_running:
+                    if measure:
+                        start_ns = perf_counter_ns()
+                        on_execute()
+                        execute.elapsed_time = elapsed_time = (perf_counter_ns() - start_ns) * 1e-9
+                        maf_add(elapsed_time)
+                    else:
+                        on_execute()
+
+                    # Check for reconfigure request
+                    if reconfigure_requested():
+                        self._begin_reconfigure()
+                        return
+
+                    # Wait for next cycle
+                    timer_wait()
+
+            except Exception as exc:
+                self._app_statistics.exception_count += 1
+                self._log_fallback("execute", exc)
+                fsm.transition(AppState.RECOVER)
 
         @self._fsm.state(AppState.RECOVER)
         def recover_handler():
             try:
-                with self._measure_time(self._app_statistics.recover):
-                    self.on_recover()
+                start_ns = time.perf_counter_ns()
+                self.on_recover()
 
-                    # One-time log
-                    if not self._app_statistics.recover.done:
-                        self._app_statistics.recover.done = True
-                        if self._log_conf.logging_flags.stages:
-                            self._logger.warning("recovering")
+                # One-time log
+                if not self._app_statistics.recover.done:
+                    self._app_statistics.recover.done = True
+                    if self._log_conf.logging_flags.stages:
+                        self._logger.warning("recovering")
+
+                self._app_statistics.recover.elapsed_time = (time.perf_counter_ns() - start_ns) * 1e-9
 
-                    # Recovery success → back to EXECUTE
-                    self._execute_timer.reset()
-                    self._fsm.transition(AppState.EXECUTE)
+                # Recovery success → back to EXECUTE
+                self._execute_timer.reset()
+                self._fsm.transition(AppState.EXECUTE)
 
             except Exception as exc:
                 self._log_fallback("recover", exc)
@@ -395,14 +555,16 @@ class App:
         def disconnect_handler():
             # Call on_disconnect callback (before databus disconnect)
             try:
-                with self._measure_time(self._app_statistics.disconnect):
-                    self.on_disconnect()
+                start_ns = time.perf_counter_ns()
+                self.on_disconnect()
 
-                    # One-time log
-                    if not self._app_statistics.disconnect.done:
-                        self._app_statistics.disconnect.done = True
-                        if self._log_conf.logging_flags.stages:
-                            self._logger.info("disconnected")
+                # One-time log
+                if not self._app_statistics.disconnect.done:
+                    self._app_statistics.disconnect.done = True
+                    if self._log_conf.logging_flags.stages:
+                        self._logger.info("disconnected")
+
+                self._app_statistics.disconnect.elapsed_time = (time.perf_counter_ns() - start_ns) * 1e-9
 
             except Exception as exc:
                 self._log_fallback("disconnect", exc)
@@ -423,12 +585,14 @@ class App:
         @self._fsm.on_error()
         def error_handler(exc: Exception):
             self._logger.error(f"fsm error: {exc}")
-            self._logger.debug(format_exc())
+            if self._log_conf.logging_flags.traceback and self._debug_enabled:
+                self._logger.debug(format_exc())
 
         # Transition callback
         @self._fsm.on_transition()
         def transition_handler(prev: AppState, next: AppState):
-            self._logger.debug(f"state: {prev} -> {next}")
+            if self._debug_enabled:
+                self._logger.debug(f"state: {prev} -> {next}")
 
     # ────────────────────────────────────────────────────────────
     # Lifecycle
@@ -440,19 +604,44 @@ class App:
 
         self._fsm.start(AppState.PREPARE)
         try:
-            while self._fsm.is_running:
-                self._manage_timer.wait()
-                self._do_manage()
+            # Kernel interval timer if requested and available (no setitimer on Windows)
+            if (self._app_conf.manage_itimer and hasattr(signal, "setitimer")
+                    and self._app_conf.manage_interval_s > 0):
+                self._run_manage_itimer()
+            else:
+                while self._fsm.is_running:
+                    self._manage_timer.wait()
+                    self._do_manage()
         except KeyboardInterrupt:
             self._logger.info("keyboard interrupt received")
         finally:
             self._stop()
 
+    def _run_manage_itimer(self) -> None:
+        interval_s = self._app_conf.manage_interval_s
+        self._manage_due = False
+        prev_handler = signal.signal(signal.SIGALRM, self._sigalrm_handler)
+        signal.setitimer(signal.ITIMER_REAL, interval_s, interval_s)
+        try:
+            # Sleep until a signal arrives (SIGALRM tick or SIGTERM)
+            while self._fsm.is_running:
+                signal.pause()
+                if self._manage_due:
+                    self._manage_due = False
+                    self._do_manage()
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, prev_handler)
+
+    def _sigalrm_handler(self, _signum: int, _frame) -> None:
+        self._manage_due = True
+
     def _sigterm_handler(self, _signum: int, _frame) -> None:
         self._logger.info("SIGTERM received")
         self._fsm.stop()
 
     def _do_manage(self) -> None:
+        self._refresh_log_levels()
         try:
             self.on_manage()
         except Exception as exc:
@@ -461,6 +650,13 @@ class App:
     def _stop(self, timeout: float = 5.0) -> None:
         self._fsm.stop(timeout)
 
+        # Close the timerfd only once the FSM thread is gone; if stop() timed out
+        # it may still be in wait(), so leave the fd to process exit
+        fsm_thread = self._fsm_thread
+        if isinstance(self._execute_timer, _AbsTimer) and (
+                fsm_thread is None or not fsm_thread.is_alive()):
+            self._execute_timer.close()
+
         # Cleanup databus
         if self._databus:
             try:
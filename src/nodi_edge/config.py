@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+from functools import lru_cache
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Data Directories
@@ -30,16 +32,19 @@ CLOUD_PUBKEY_FILE = "/etc/nodi/cloud_pubkey.pem"
 IDENTITY_FILE = "/etc/nodi/identity"
 
 
+@lru_cache(maxsize=1)
 def get_serial_number() -> str:
-    import os
+    import re
     import socket
 
-    # Read from identity file
-    if os.path.exists(IDENTITY_FILE):
+    # Read from identity file (fixed for the process lifetime → cached)
+    try:
         with open(IDENTITY_FILE) as f:
-            for line in f:
-                if line.startswith("SERIAL_NUMBER="):
-                    return line.split("=", 1)[1].strip()
+            match = re.search(r"^SERIAL_NUMBER=(.*)$", f.read(), re.MULTILINE)
+        if match:
+            return match.group(1).strip()
+    except FileNotFoundError:
+        pass
 
     # Fallback: generate from hostname
     hostname = socket.gethostname()
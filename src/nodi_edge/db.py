@@ -4,10 +4,21 @@ from __future__ import annotations
 import json
 import sqlite3
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 from nodi_edge.config import DB_PATH
 
+# Optional fast JSON codec (config column stays TEXT, so decode to str)
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Types
@@ -18,8 +29,8 @@ InterfaceId = str
 ConnId = str
 AppId = str
 
-# Protocol code → module mapping
-PROTOCOL_MODULES: Dict[str, str] = {
+# Protocol code → module mapping (read-only)
+PROTOCOL_MODULES: Mapping[str, str] = MappingProxyType({
     "mtc": "nodi_edge_interface.modbus_tcp_client",
     "mts": "nodi_edge_interface.modbus_tcp_server",
     "mvc": "nodi_edge_interface.modbus_rtu_tcp_client",
@@ -35,13 +46,68 @@ PROTOCOL_MODULES: Dict[str, str] = {
     "rdc": "nodi_edge_interface.rdb_client",
     "rac": "nodi_edge_interface.rest_client",
     "ras": "nodi_edge_interface.rest_server",
-}
+})
 
-# Addon app modules
-ADDON_MODULES: Dict[str, str] = {
+# Addon app modules (read-only)
+ADDON_MODULES: Mapping[str, str] = MappingProxyType({
     "vplc": "nodi_edge_addon.virtual_plc",
     "snf": "nodi_edge_addon.store_forward",
-}
+})
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SQL
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# sqlite3 caches compiled statements keyed by SQL text
+_STATEMENT_CACHE_SIZE = 256
+
+_SELECT_APP_SQL = "SELECT * FROM app_registry WHERE app_id = ?"
+_SELECT_APP_ENABLED_SQL = "SELECT enabled FROM app_registry WHERE app_id = ?"
+_SELECT_APP_SERVICES_SQL = (
+    "SELECT app_id, category, module, enabled, conn_id "
+    "FROM app_registry ORDER BY app_id")
+_SELECT_EXPIRED_APPS_SQL = (
+    "SELECT app_id FROM app_registry "
+    "WHERE category = ? AND enabled = 1 "
+    "  AND license_expires_at > 0 AND license_expires_at <= ? "
+    "ORDER BY app_id")
+_SELECT_CONN_PROTOCOLS_ENABLED_SQL = (
+    "SELECT conn, protocol FROM conns WHERE use = 1 ORDER BY conn")
+_SELECT_INTERFACE_SQL = "SELECT * FROM interface WHERE interface = ?"
+_SELECT_BLOCKS_BY_CONN_SQL = "SELECT * FROM blocks WHERE conn = ? ORDER BY block"
+_SELECT_PROT_PROP_ALL_SQL = (
+    "SELECT pos, key, type, label FROM prot_prop "
+    "WHERE prot = ? AND layer = ? ORDER BY pos")
+_PROT_PROP_COLUMN_INDEX = {"type": 2, "label": 3}
+
+_UPDATE_APP_LICENSE_SQL = (
+    "UPDATE app_registry SET "
+    "  license_token = ?, license_expires_at = ?, "
+    "  enabled = ?, updated_at = ? "
+    "WHERE app_id = ?")
+
+_UPSERT_APP_SQL = (
+    "INSERT INTO app_registry "
+    "(app_id, category, module, enabled, config, interface_id, conn_id, "
+    " license_token, license_expires_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(app_id) DO UPDATE SET "
+    "  category=excluded.category, module=excluded.module, "
+    "  enabled=excluded.enabled, config=excluded.config, "
+    "  interface_id=excluded.interface_id, conn_id=excluded.conn_id, "
+    "  license_token=excluded.license_token, "
+    "  license_expires_at=excluded.license_expires_at, "
+    "  updated_at=excluded.updated_at")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Helpers
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _now_s() -> int:
+    # Integer epoch seconds straight from the ns clock (no float round-trip)
+    return time.time_ns() // 1_000_000_000
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -50,21 +116,46 @@ ADDON_MODULES: Dict[str, str] = {
 
 class EdgeDB:
 
-    def __init__(self, db_path: str = DB_PATH):
+    # Set while inside transaction(); writes then defer their commit
+    _in_tx: bool = False
+
+    # prot_prop lookups by (view, prot, layer); the table is static at runtime
+    _prot_prop_cache: Optional[Dict[Tuple[str, str, str], Any]] = None
+
+    def __init__(self, db_path: str = DB_PATH, *, check_same_thread: bool = True):
         self._db_path = db_path
+        # False only for owners that hand the connection across threads
+        # without concurrent use (e.g. opened on the FSM thread, closed at exit)
+        self._check_same_thread = check_same_thread
         self._conn: Optional[sqlite3.Connection] = None
 
     def open(self) -> None:
-        self._conn = sqlite3.connect(self._db_path)
+        self._conn = sqlite3.connect(self._db_path,
+                                     check_same_thread=self._check_same_thread,
+                                     cached_statements=_STATEMENT_CACHE_SIZE)
         self._conn.row_factory = sqlite3.Row
+        # WAL + synchronous=NORMAL: a power loss can drop the last commits
+        # but never corrupts the DB (acceptable for config/registry data)
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("PRAGMA busy_timeout=30000")
         self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Read path: page cache up to 20 MB, mmap'd reads, in-memory temp tables
+        self._conn.execute("PRAGMA cache_size=-20000")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        # Bound WAL growth between checkpoints
+        self._conn.execute("PRAGMA wal_autocheckpoint=1000")
+        self._conn.execute("PRAGMA journal_size_limit=6144000")
 
     def close(self) -> None:
         if self._conn:
             self._conn.close()
             self._conn = None
+        self._prot_prop_cache = None
+
+    def reload_schema(self) -> None:
+        """Drop cached prot_prop lookups (call after prot_prop changes)."""
+        self._prot_prop_cache = None
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -72,6 +163,33 @@ class EdgeDB:
             raise RuntimeError("database not opened")
         return self._conn
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into a single commit (rolled back on error)."""
+        if self._in_tx:
+            # Nested → join the outer transaction
+            yield
+            return
+        self._in_tx = True
+        try:
+            yield
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self._in_tx = False
+
+    def _commit(self) -> None:
+        if not self._in_tx:
+            self.conn.commit()
+
+    def _tuple_cursor(self) -> sqlite3.Cursor:
+        # Plain tuple rows for positional unpacking (no sqlite3.Row per row)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
 
     # App Registry - CRUD
     # ──────────────────────────────────────────────────────────────────────
@@ -86,9 +204,31 @@ class EdgeDB:
             "SELECT * FROM app_registry ORDER BY app_id").fetchall()
 
     def select_app(self, app_id: str) -> Optional[sqlite3.Row]:
-        return self.conn.execute(
-            "SELECT * FROM app_registry WHERE app_id = ?",
-            (app_id,)).fetchone()
+        return self.conn.execute(_SELECT_APP_SQL, (app_id,)).fetchone()
+
+    def select_app_services(self) -> List[Tuple[str, str, str, int, Optional[str]]]:
+        """(app_id, category, module, enabled, conn_id) for every registered app."""
+        return self._tuple_cursor().execute(_SELECT_APP_SERVICES_SQL).fetchall()
+
+    def select_expired_apps(self, category: str, now: int) -> List[str]:
+        """Enabled apps of a category whose license expired at or before now."""
+        cursor = self._tuple_cursor().execute(_SELECT_EXPIRED_APPS_SQL, (category, now))
+        return [app_id for (app_id,) in cursor]
+
+    def select_apps_in(self, app_ids: Iterable[str]) -> Set[str]:
+        """Subset of app_ids already registered (one query for the whole set)."""
+        ids = list(app_ids)
+        if not ids:
+            return set()
+        placeholders = ",".join("?" * len(ids))
+        cursor = self._tuple_cursor().execute(
+            f"SELECT app_id FROM app_registry WHERE app_id IN ({placeholders})", ids)
+        return {app_id for (app_id,) in cursor}
+
+    def select_app_enabled(self, app_id: str) -> Optional[bool]:
+        # Single-column read; skips config/license_token payloads (None = not registered)
+        row = self.conn.execute(_SELECT_APP_ENABLED_SQL, (app_id,)).fetchone()
+        return None if row is None else bool(row[0])
 
     def upsert_app(self,
                    app_id: str,
@@ -100,49 +240,61 @@ class EdgeDB:
                    conn_id: Optional[str] = None,
                    license_token: Optional[str] = None,
                    license_expires_at: Optional[int] = None) -> None:
-        now = int(time.time())
-        config_json = json.dumps(config) if config else "{}"
+        now = _now_s()
+        config_json = _json_dumps(config) if config else "{}"
         self.conn.execute(
-            "INSERT INTO app_registry "
-            "(app_id, category, module, enabled, config, interface_id, conn_id, "
-            " license_token, license_expires_at, updated_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
-            "ON CONFLICT(app_id) DO UPDATE SET "
-            "  category=excluded.category, module=excluded.module, "
-            "  enabled=excluded.enabled, config=excluded.config, "
-            "  interface_id=excluded.interface_id, conn_id=excluded.conn_id, "
-            "  license_token=excluded.license_token, "
-            "  license_expires_at=excluded.license_expires_at, "
-            "  updated_at=excluded.updated_at",
+            _UPSERT_APP_SQL,
             (app_id, category, module, int(enabled), config_json, interface_id,
              conn_id, license_token, license_expires_at, now))
-        self.conn.commit()
+        self._commit()
+
+    def upsert_apps_many(self,
+                         apps: List[Tuple[str, str, str, bool, Optional[str]]]) -> None:
+        """Upsert (app_id, category, module, enabled, conn_id) rows in one transaction."""
+        if not apps:
+            return
+        now = _now_s()
+        self.conn.executemany(
+            _UPSERT_APP_SQL,
+            [(app_id, category, module, int(enabled), "{}", None,
+              conn_id, None, None, now)
+             for app_id, category, module, enabled, conn_id in apps])
+        self._commit()
 
     def update_app_enabled(self, app_id: str, enabled: bool) -> None:
-        now = int(time.time())
+        now = _now_s()
         self.conn.execute(
             "UPDATE app_registry SET enabled = ?, updated_at = ? WHERE app_id = ?",
             (int(enabled), now, app_id))
-        self.conn.commit()
+        self._commit()
 
     def update_app_license(self,
                            app_id: str,
                            license_token: Optional[str],
                            license_expires_at: Optional[int],
                            enabled: bool) -> None:
-        now = int(time.time())
+        now = _now_s()
         self.conn.execute(
-            "UPDATE app_registry SET "
-            "  license_token = ?, license_expires_at = ?, "
-            "  enabled = ?, updated_at = ? "
-            "WHERE app_id = ?",
+            _UPDATE_APP_LICENSE_SQL,
             (license_token, license_expires_at, int(enabled), now, app_id))
-        self.conn.commit()
+        self._commit()
+
+    def update_app_licenses_many(self,
+                                 licenses: List[Tuple[str, Optional[str], Optional[int], bool]]) -> None:
+        """Update (app_id, license_token, license_expires_at, enabled) rows in one transaction."""
+        if not licenses:
+            return
+        now = _now_s()
+        self.conn.executemany(
+            _UPDATE_APP_LICENSE_SQL,
+            [(license_token, license_expires_at, int(enabled), now, app_id)
+             for app_id, license_token, license_expires_at, enabled in licenses])
+        self._commit()
 
     def delete_app(self, app_id: str) -> None:
         self.conn.execute(
             "DELETE FROM app_registry WHERE app_id = ?", (app_id,))
-        self.conn.commit()
+        self._commit()
 
 
     # Interface - Read + Change Detection
@@ -153,9 +305,7 @@ class EdgeDB:
             "SELECT * FROM interface ORDER BY interface").fetchall()
 
     def select_interface(self, interface_id: str) -> Optional[sqlite3.Row]:
-        return self.conn.execute(
-            "SELECT * FROM interface WHERE interface = ?",
-            (interface_id,)).fetchone()
+        return self.conn.execute(_SELECT_INTERFACE_SQL, (interface_id,)).fetchone()
 
     def select_interfaces_updated_after(self, ts: int) -> List[sqlite3.Row]:
         return self.conn.execute(
@@ -168,9 +318,9 @@ class EdgeDB:
         return row[0]
 
     def select_interface_ids(self) -> List[str]:
-        rows = self.conn.execute(
-            "SELECT interface FROM interface ORDER BY interface").fetchall()
-        return [r[0] for r in rows]
+        cursor = self._tuple_cursor().execute(
+            "SELECT interface FROM interface ORDER BY interface")
+        return [interface_id for (interface_id,) in cursor]
 
 
     # Connection - Read
@@ -184,6 +334,10 @@ class EdgeDB:
         return self.conn.execute(
             "SELECT * FROM conns WHERE use = 1 ORDER BY conn").fetchall()
 
+    def select_conn_protocols_enabled(self) -> List[Tuple[str, str]]:
+        """(conn, protocol) for every enabled connection."""
+        return self._tuple_cursor().execute(_SELECT_CONN_PROTOCOLS_ENABLED_SQL).fetchall()
+
     def select_conn(self, conn_id: str) -> Optional[sqlite3.Row]:
         return self.conn.execute(
             "SELECT * FROM conns WHERE conn = ?", (conn_id,)).fetchone()
@@ -193,9 +347,7 @@ class EdgeDB:
     # ──────────────────────────────────────────────────────────────────────
 
     def select_blocks_by_conn(self, conn_id: str) -> List[sqlite3.Row]:
-        return self.conn.execute(
-            "SELECT * FROM blocks WHERE conn = ? ORDER BY block",
-            (conn_id,)).fetchall()
+        return self.conn.execute(_SELECT_BLOCKS_BY_CONN_SQL, (conn_id,)).fetchall()
 
     def select_blocks_tags_by_block(self, block_id: str) -> List[sqlite3.Row]:
         return self.conn.execute(
@@ -208,18 +360,40 @@ class EdgeDB:
 
     def select_prot_prop_mapping(self,
                                  prot_code: str,
-                                 layer: str) -> Dict[int, Tuple[str, str]]:
-        rows = self.conn.execute(
-            "SELECT pos, key, type FROM prot_prop "
-            "WHERE prot = ? AND layer = ? ORDER BY pos",
-            (prot_code, layer)).fetchall()
-        return {r["pos"]: (r["key"], r["type"]) for r in rows}
+                                 layer: str) -> Mapping[int, Tuple[str, str]]:
+        return self._select_prot_prop_view("type", prot_code, layer)
 
     def select_prot_prop_labels(self,
                                 prot_code: str,
-                                layer: str) -> Dict[int, Tuple[str, str]]:
-        rows = self.conn.execute(
-            "SELECT pos, key, label FROM prot_prop "
-            "WHERE prot = ? AND layer = ? ORDER BY pos",
-            (prot_code, layer)).fetchall()
-        return {r["pos"]: (r["key"], r["label"]) for r in rows}
+                                layer: str) -> Mapping[int, Tuple[str, str]]:
+        return self._select_prot_prop_view("label", prot_code, layer)
+
+    def select_prot_prop_all(self,
+                             prot_code: str,
+                             layer: str) -> Tuple[Tuple[int, str, str, str], ...]:
+        """(pos, key, type, label) rows; one scan serves mapping and labels."""
+        cache = self._prot_prop_cache
+        if cache is None:
+            cache = self._prot_prop_cache = {}
+        key = ("all", prot_code, layer)
+        rows = cache.get(key)
+        if rows is None:
+            rows = cache[key] = tuple(
+                tuple(r) for r in self.conn.execute(
+                    _SELECT_PROT_PROP_ALL_SQL, (prot_code, layer)))
+        return rows
+
+    def _select_prot_prop_view(self,
+                               column: str,
+                               prot_code: str,
+                               layer: str) -> Mapping[int, Tuple[str, str]]:
+        # Read-only views, so the cached mapping can be shared by callers
+        key = (column, prot_code, layer)
+        cache = self._prot_prop_cache
+        mapping = cache.get(key) if cache is not None else None
+        if mapping is None:
+            rows = self.select_prot_prop_all(prot_code, layer)
+            idx = _PROT_PROP_COLUMN_INDEX[column]
+            mapping = self._prot_prop_cache[key] = MappingProxyType(
+                {row[0]: (row[1], row[idx]) for row in rows})
+        return mapping
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import json
+import atexit
 import sys
 import time
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 from nodi_edge.app import App, AppConfig
@@ -14,7 +15,26 @@ from nodi_edge.db import EdgeDB, PROTOCOL_MODULES
 # Constants
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-_CONN_INFO_KEYS = ("host", "port", "timeout", "retry")
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Data Classes
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class ConnConfig:
+    """Connection-level settings; any change requires a process restart."""
+    host: Optional[str] = None
+    port: Optional[int] = None
+    timeout: Optional[float] = None
+    retry: Optional[int] = None
+
+    @classmethod
+    def from_conn(cls, conn: Dict[str, Any]) -> ConnConfig:
+        get = conn.get
+        return cls(get("host"), get("port"), get("timeout"), get("retry"))
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -38,10 +58,12 @@ class InterfaceApp(App):
 
         self._conn_id: str = self._cli_args.conn_id
         self._protocol: str = protocol
+        self._module: Optional[str] = PROTOCOL_MODULES.get(protocol)
 
         # Config state (loaded from DB)
         self._db: Optional[EdgeDB] = None
         self._conn_config: Optional[Dict[str, Any]] = None
+        self._conn_info: Optional[ConnConfig] = None
         self._block_configs: List[Dict[str, Any]] = []
 
         # System tag for config reload
@@ -56,10 +78,18 @@ class InterfaceApp(App):
     def conn_id(self) -> str:
         return self._conn_id
 
+    @property
+    def module(self) -> Optional[str]:
+        return self._module
+
     @property
     def conn_config(self) -> Optional[Dict[str, Any]]:
         return self._conn_config
 
+    @property
+    def conn_info(self) -> Optional[ConnConfig]:
+        return self._conn_info
+
     @property
     def block_configs(self) -> List[Dict[str, Any]]:
         return self._block_configs
@@ -71,25 +101,27 @@ class InterfaceApp(App):
 
     def _load_config(self) -> None:
         """Load connection and block configs from DB."""
-        row = self._db.select_conn(self._conn_id)
+        db = self._db
+        conn_id = self._conn_id
+
+        row = db.select_conn(conn_id)
         if not row:
-            raise RuntimeError(f"connection not found: {self._conn_id}")
-        self._conn_config = dict(row)
+            raise RuntimeError(f"connection not found: {conn_id}")
+        conn_config = dict(row)
+        block_configs = [dict(r) for r in db.select_blocks_by_conn(conn_id)]
 
-        self._block_configs = [dict(r) for r in
-                               self._db.select_blocks_by_conn(self._conn_id)]
-        self._logger.info(
-            f"loaded config: conn={self._conn_id}, "
-            f"blocks={len(self._block_configs)}")
+        self._conn_config = conn_config
+        self._conn_info = ConnConfig.from_conn(conn_config)
+        self._block_configs = block_configs
+        if self._info_enabled:
+            self._logger.info(
+                f"loaded config: conn={conn_id}, blocks={len(block_configs)}")
 
     @staticmethod
     def _is_conn_info_changed(prev: Dict[str, Any],
                               curr: Dict[str, Any]) -> bool:
         """Check if connection-level info (host/port/timeout/retry) changed."""
-        for key in _CONN_INFO_KEYS:
-            if prev.get(key) != curr.get(key):
-                return True
-        return False
+        return ConnConfig.from_conn(prev) != ConnConfig.from_conn(curr)
 
 
     # ────────────────────────────────────────────────────────────
@@ -98,16 +130,17 @@ class InterfaceApp(App):
 
     def _on_config_reload_tag(self, tag_id: str, tag_data) -> None:
         """TagBus callback when config_reload system tag changes."""
-        self._logger.info(f"config reload signal received: {tag_id}")
+        if self._info_enabled:
+            self._logger.info(f"config reload signal received: {tag_id}")
 
-        # Save previous conn config for change detection
-        prev_conn = dict(self._conn_config) if self._conn_config else {}
+        # Keep previous conn info for change detection (immutable, no copy)
+        prev_info = self._conn_info
 
         # Reload from DB
         self._load_config()
 
         # Detect change type
-        if self._is_conn_info_changed(prev_conn, self._conn_config):
+        if prev_info != self._conn_info:
             # Connection info changed -> need full restart
             self._logger.warning(
                 "connection info changed, restarting via sys.exit()")
@@ -122,9 +155,14 @@ class InterfaceApp(App):
     # ────────────────────────────────────────────────────────────
 
     def on_prepare(self) -> None:
-        # Open database
-        self._db = EdgeDB()
-        self._db.open()
+        # Open database once per process; it stays open across
+        # DISCONNECT → CONNECT retries and is closed at interpreter exit.
+        # Opened here on the FSM thread but closed by atexit on the main
+        # thread (after the FSM has stopped), hence check_same_thread=False
+        if self._db is None:
+            self._db = EdgeDB(check_same_thread=False)
+            self._db.open()
+            atexit.register(self._db.close)
 
         # Load initial config
         self._load_config()
@@ -158,13 +196,10 @@ class InterfaceApp(App):
         self.on_interface_recover()
 
     def on_disconnect(self) -> None:
+        # Database stays open: retries resume at CONNECT and config
+        # reloads still read from it
         self.on_interface_disconnect()
 
-        # Close database
-        if self._db:
-            self._db.close()
-            self._db = None
-
 
     # ────────────────────────────────────────────────────────────
     # Protocol Override Points
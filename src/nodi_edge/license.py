@@ -2,10 +2,43 @@
 from __future__ import annotations
 
 import json
+import os
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+# Optional: PyJWT (required only when a public key is installed)
+try:
+    import jwt as _jwt
+except ImportError:
+    _jwt = None
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Constants
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+_TOKEN_SUFFIX = ".token"
+_TOKEN_SUFFIX_LEN = len(_TOKEN_SUFFIX)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Helpers
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _read_token(path: str) -> str:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 8192)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks).decode("utf-8").strip()
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # LicenseManager
@@ -19,24 +52,29 @@ class LicenseManager:
         self._pubkey_file = pubkey_file
         self._cache_dir = Path(cache_dir)
         self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_dir_s = str(self._cache_dir)
 
         # Load public key
         self._pubkey: Optional[Any] = None
         self._load_pubkey()
 
+        # Verified claims by token (exp re-checked on every hit)
+        self._claims_cache: Dict[str, Dict[str, Any]] = {}
+
     def _load_pubkey(self) -> None:
         pubkey_path = Path(self._pubkey_file)
         if not pubkey_path.exists():
             return
 
+        if _jwt is None:
+            raise ImportError("PyJWT is required for license validation: pip install PyJWT[crypto]")
+
         try:
-            import jwt
-            with open(pubkey_path, "r") as f:
+            with open(pubkey_path, "rb") as f:
                 pem_data = f.read()
-            # Store raw PEM for jwt.decode
-            self._pubkey = pem_data
-        except ImportError:
-            raise ImportError("PyJWT is required for license validation: pip install PyJWT[crypto]")
+            # Parse PEM once; jwt.decode accepts the key object directly
+            from cryptography.hazmat.primitives.serialization import load_pem_public_key
+            self._pubkey = load_pem_public_key(pem_data)
         except Exception:
             self._pubkey = None
 
@@ -48,21 +86,27 @@ class LicenseManager:
         if not self._pubkey:
             return None
 
+        claims = self._claims_cache.get(token)
+        if claims is not None:
+            if claims["exp"] > time.time():
+                return claims
+            self._claims_cache.pop(token, None)
+            return None
+
         try:
-            import jwt
-            claims = jwt.decode(token, self._pubkey,
-                                algorithms=["RS256"],
-                                options={"require": ["exp", "app_id", "serial_number"]})
-            return claims
+            claims = _jwt.decode(token, self._pubkey,
+                                 algorithms=["RS256"],
+                                 options={"require": ["exp", "app_id", "serial_number"]})
         except Exception:
             return None
+        self._claims_cache[token] = claims
+        return claims
 
     def is_token_expired(self, token: str) -> bool:
         try:
-            import jwt
-            jwt.decode(token, self._pubkey,
-                       algorithms=["RS256"],
-                       options={"verify_exp": True})
+            _jwt.decode(token, self._pubkey,
+                        algorithms=["RS256"],
+                        options={"verify_exp": True})
             return False
         except Exception:
             return True
@@ -76,19 +120,23 @@ class LicenseManager:
         token_path.write_text(token, encoding="utf-8")
 
     def remove_cached_token(self, app_id: str) -> None:
-        token_path = self._cache_dir / f"{app_id}.token"
-        if token_path.exists():
-            token_path.unlink()
+        try:
+            os.unlink(f"{self._cache_dir_s}/{app_id}.token")
+        except FileNotFoundError:
+            pass
 
     def load_cached_token(self, app_id: str) -> Optional[str]:
-        token_path = self._cache_dir / f"{app_id}.token"
-        if token_path.exists():
-            return token_path.read_text(encoding="utf-8").strip()
-        return None
+        try:
+            return _read_token(f"{self._cache_dir_s}/{app_id}.token")
+        except FileNotFoundError:
+            return None
 
     def load_cached_tokens(self) -> Dict[str, str]:
+        # One directory scan, raw fd reads (no Path objects per token)
         tokens = {}
-        for token_path in self._cache_dir.glob("*.token"):
-            app_id = token_path.stem
-            tokens[app_id] = token_path.read_text(encoding="utf-8").strip()
+        with os.scandir(self._cache_dir_s) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(_TOKEN_SUFFIX) and entry.is_file():
+                    tokens[name[:-_TOKEN_SUFFIX_LEN]] = _read_token(entry.path)
         return tokens
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 
 
-class AppState(Enum):
+class AppState(IntEnum):
     """Application lifecycle states.
 
     State flow:
@@ -34,3 +34,11 @@ class AppState(Enum):
     EXECUTE = auto()
     RECOVER = auto()
     DISCONNECT = auto()
+
+    # Int hashing/compare for FSM lookups, but keep "AppState.X" in logs
+    # (IntEnum.__str__ returns the bare value on Python 3.11+)
+    __str__ = Enum.__str__
+
+    def __format__(self, format_spec: str) -> str:
+        # f-strings use int.__format__ on Python 3.9/3.10 unless overridden here
+        return str.__format__(str(self), format_spec)
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-__version__ = "0.1.0"
+
+from nodi_edge import __version__ as __version__  # single version source for the distribution
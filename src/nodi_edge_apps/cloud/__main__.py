@@ -17,10 +17,17 @@ if __name__ == "__main__":
                    cloud_config=cloud_config,
                    app_config=app_config)
 
-    # Report data getter
+    # Report data getter (psutil functions bound once)
+    cpu_percent = psutil.cpu_percent
+    virtual_memory = psutil.virtual_memory
+
+    # Non-blocking sampling: each call measures since the previous one,
+    # so prime it once here (the very first sample is always 0.0)
+    cpu_percent(interval=None)
+
     def get_report_data() -> Dict[str, Any]:
-        return {"cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent}
+        return {"cpu_percent": cpu_percent(interval=None),
+                "memory_percent": virtual_memory().percent}
 
     app.set_report_data_getter(get_report_data)
 
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
+from typing import Any, Dict
 
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class CloudServerConfig:
     host: str = "43.202.161.226"
     port: int = 1883
@@ -16,7 +21,7 @@ class CloudServerConfig:
 CLOUD_SERVER = CloudServerConfig()
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class TopicFormats:
     report: str = "/ne/{sn}/report"
     request: str = "/ne/{sn}/request"
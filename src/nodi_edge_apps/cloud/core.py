@@ -10,14 +10,25 @@ from dataclasses import dataclass, field
 from queue import Queue, Empty
 from typing import Any, Callable, Dict, List, Optional
 
-import psutil
-
 from nodi_libs import MqttClient, MqttTransportType, OtaManager, OtaConfig, OtaStatus
 
 from nodi_edge import App, AppConfig
 from nodi_edge.config import OTA_BACKUP_DIR, get_serial_number
 from .config import CLOUD_SERVER, TOPIC_FORMATS
 
+# Optional fast JSON codec (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        # Non-str keys are stringified like json.dumps (handler data is free-form)
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Types
@@ -245,7 +256,8 @@ class CloudApp(App):
 
     def _on_mqtt_message(self, client, userdata, message):
         try:
-            payload = json.loads(message.payload.decode("utf-8"))
+            # Both decoders accept the raw UTF-8 bytes (no intermediate str)
+            payload = _json_loads(message.payload)
             self._handle_request(payload)
         except json.JSONDecodeError as exc:
             self.logger.error(f"invalid json: {exc}")
@@ -298,7 +310,7 @@ class CloudApp(App):
             payload["error"] = error
 
         self._mqtt_client.publish(topic=self._response_topic,
-                                  payload=json.dumps(payload),
+                                  payload=_json_dumps(payload),
                                   qos=self._cloud_config.publish_qos,
                                   retain=self._cloud_config.retain)
 
@@ -318,7 +330,7 @@ class CloudApp(App):
             payload["error"] = error
 
         self._mqtt_client.publish(topic=self._result_topic,
-                                  payload=json.dumps(payload),
+                                  payload=_json_dumps(payload),
                                   qos=self._cloud_config.publish_qos,
                                   retain=self._cloud_config.retain)
         self.logger.info(f"task completed: {task_id} ({command}) -> {status}")
@@ -391,7 +403,7 @@ class CloudApp(App):
                        "data": data}
 
             self._mqtt_client.publish(topic=self._report_topic,
-                                      payload=json.dumps(payload),
+                                      payload=_json_dumps(payload),
                                       qos=self._cloud_config.publish_qos,
                                       retain=self._cloud_config.retain)
         except Exception as exc:
@@ -502,7 +514,7 @@ class CloudApp(App):
         if not self.databus:
             return
         self.databus.set_tags({
-            f"supervisor/_cmd/{command}": json.dumps(payload)})
+            f"supervisor/_cmd/{command}": _json_dumps(payload)})
         self.databus.commit()
 
     def _read_supervisor_services(self) -> Dict[str, Any]:
@@ -512,7 +524,7 @@ class CloudApp(App):
         tag_data = tags.get("supervisor/_meta/services")
         if tag_data and isinstance(tag_data.v, str):
             try:
-                return json.loads(tag_data.v)
+                return _json_loads(tag_data.v)
             except (json.JSONDecodeError, TypeError):
                 pass
         return {}
@@ -557,5 +569,5 @@ class CloudApp(App):
                        "status": status.value,
                        "timestamp": int(time.time() * 1000)}
             self._mqtt_client.publish(topic=self._result_topic,
-                                      payload=json.dumps(payload),
+                                      payload=_json_dumps(payload),
                                       qos=self._cloud_config.publish_qos)
@@ -2,17 +2,32 @@
 from __future__ import annotations
 
 import json
-import subprocess
+import os
+import sys
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from nodi_edge.app import App, AppConfig
 from nodi_edge.config import DB_PATH, LICENSE_DIR, CLOUD_PUBKEY_FILE
 from nodi_edge.db import EdgeDB, PROTOCOL_MODULES, ADDON_MODULES
 
+# Optional fast JSON codec (tag values stay str for TagBus consumers;
+# orjson.JSONDecodeError subclasses json.JSONDecodeError)
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Constants
@@ -30,64 +45,119 @@ _SVC_PREFIX_ADDON = "ne-addon"
 _TAG_CMD_PREFIX = f"{_APP_ID}/_cmd"
 _TAG_EVENT_PREFIX = f"{_APP_ID}/_event"
 _TAG_META_PREFIX = f"{_APP_ID}/_meta"
+_CMD_PREFIX = f"{_TAG_CMD_PREFIX}/"
+_TAG_CMD_ALL = f"{_TAG_CMD_PREFIX}/**"
+
+# Status tags (built once; _publish_status runs every manage cycle)
+_TAG_META_STATE = f"{_TAG_META_PREFIX}/state"
+_TAG_META_EXCEPTION_COUNT = f"{_TAG_META_PREFIX}/exception_count"
+_TAG_META_SERVICES = f"{_TAG_META_PREFIX}/services"
+_TAG_META_SERVICE_COUNT = f"{_TAG_META_PREFIX}/service_count"
+_TAG_META_ACTIVE_COUNT = f"{_TAG_META_PREFIX}/active_count"
+_CMD_PREFIX_LEN = len(_CMD_PREFIX)
 
 # System tags for conn lifecycle events
 _TAG_SYS_CONN_ADDED = "/system/supervisor/conn_added"
 _TAG_SYS_CONN_REMOVED = "/system/supervisor/conn_removed"
 
-# Healthcheck
-_MAX_RESTART_COUNT = 5
-_RESTART_COUNT_RESET_S = 300
-
-# systemd unit templates
-_INTERFACE_SERVICE_TEMPLATE = """\
-[Unit]
-Description=Nodi Edge Interface: {app_id}
-After=network.target ne-supervisor.service
-Requires=ne-supervisor.service
-
-[Service]
-Type=simple
-User=root
-Group=root
-ExecStart={python} -m {module} --conn-id={conn_id}
-Restart=always
-RestartSec=5
-StartLimitIntervalSec=300
-StartLimitBurst=5
-Environment=PYTHONUNBUFFERED=1
-
-[Install]
-WantedBy=multi-user.target
-"""
-
-_ADDON_SERVICE_TEMPLATE = """\
-[Unit]
-Description=Nodi Edge Addon: {app_id}
-After=network.target ne-supervisor.service
-Requires=ne-supervisor.service
-
-[Service]
-Type=simple
-User=root
-Group=root
-ExecStart={python} -m {module}
-Restart=on-failure
-RestartSec=5
-StartLimitIntervalSec=300
-StartLimitBurst=5
-Environment=PYTHONUNBUFFERED=1
-
-[Install]
-WantedBy=multi-user.target
-"""
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Restart throttling is left to systemd (Restart=/StartLimitBurst= in the units);
+# the supervisor itself is watched via sd_notify (WatchdogSec= in its unit)
+_NOTIFY_SOCKET_ENV = "NOTIFY_SOCKET"
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# systemd Notify
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _sd_notify(message: str) -> bool:
+    address = os.environ.get(_NOTIFY_SOCKET_ENV)
+    if not address:
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]
+
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(message.encode())
+        return True
+    except OSError:
+        return False
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Unit Renderers
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _render_interface_unit(app_id: str, module: str, conn_id: str) -> bytes:
+    return (
+        f"[Unit]\n"
+        f"Description=Nodi Edge Interface: {app_id}\n"
+        f"After=network.target ne-supervisor.service\n"
+        f"Requires=ne-supervisor.service\n"
+        f"StartLimitIntervalSec=300\n"
+        f"StartLimitBurst=5\n"
+        f"\n"
+        f"[Service]\n"
+        f"Type=simple\n"
+        f"User=root\n"
+        f"Group=root\n"
+        f"ExecStart={_VENV_PYTHON} -m {module} --conn-id={conn_id}\n"
+        f"Restart=always\n"
+        f"RestartSec=5\n"
+        f"Environment=PYTHONUNBUFFERED=1\n"
+        f"\n"
+        f"[Install]\n"
+        f"WantedBy=multi-user.target\n").encode()
+
+
+def _render_addon_unit(app_id: str, module: str) -> bytes:
+    return (
+        f"[Unit]\n"
+        f"Description=Nodi Edge Addon: {app_id}\n"
+        f"After=network.target ne-supervisor.service\n"
+        f"Requires=ne-supervisor.service\n"
+        f"StartLimitIntervalSec=300\n"
+        f"StartLimitBurst=5\n"
+        f"\n"
+        f"[Service]\n"
+        f"Type=simple\n"
+        f"User=root\n"
+        f"Group=root\n"
+        f"ExecStart={_VENV_PYTHON} -m {module}\n"
+        f"Restart=on-failure\n"
+        f"RestartSec=5\n"
+        f"Environment=PYTHONUNBUFFERED=1\n"
+        f"\n"
+        f"[Install]\n"
+        f"WantedBy=multi-user.target\n").encode()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Naming
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@lru_cache(maxsize=None)
+def _event_tag(event: str) -> str:
+    # Event names are a small fixed set; build each tag string once
+    return f"{_TAG_EVENT_PREFIX}/{event}"
+
+
+def _service_name(app_id: str, category: str) -> str:
+    if category == "interface":
+        return f"{_SVC_PREFIX_INTERFACE}-{app_id}"
+    return f"{_SVC_PREFIX_ADDON}-{app_id}"
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Types
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ServiceState:
     app_id: str
     category: str
@@ -95,16 +165,27 @@ class ServiceState:
     enabled: bool
     conn_id: Optional[str] = None
     active: bool = False
-    restart_count: int = 0
-    last_restart_ts: float = 0.0
+    running: bool = False
+    # Derived once from app_id/category (both fixed for the state's lifetime)
+    svc_name: str = field(init=False, repr=False)
+    svc_path: Path = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.svc_name = _service_name(self.app_id, self.category)
+        self.svc_path = _SYSTEMD_DIR / f"{self.svc_name}.service"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SupervisorConfig:
     db_path: str = DB_PATH
     license_dir: str = LICENSE_DIR
     pubkey_file: str = CLOUD_PUBKEY_FILE
     license_check_interval_s: float = 60.0
+    # Observe-only poll (systemd restarts units itself); 0 = every manage cycle
+    healthcheck_interval_s: float = 30.0
+    # Stop feeding the watchdog once the FSM thread has made no progress this long
+    # (keep below WatchdogSec= in ne-supervisor.service)
+    watchdog_stall_s: float = 45.0
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -129,15 +210,40 @@ class SupervisorApp(App):
         # License manager (lazy import to avoid hard dependency on PyJWT)
         self._license_mgr = None
 
-        # Service state (in-memory runtime tracking)
+        # Service state (in-memory runtime tracking); the dict is copy-on-write:
+        # writers swap in a new dict under _lock, readers use it lock-free
         self._services: Dict[str, ServiceState] = {}
         self._lock = threading.Lock()
 
+        # Tuple view of _services for lock-free iteration
+        # (rebuilt under _lock after every insert/remove)
+        self._services_snap: Tuple[ServiceState, ...] = ()
+
+        # Status cache (services JSON rebuilt only when a ServiceState changes);
+        # counts are kept incrementally by _set_active/_update_services_snap
+        self._services_dirty: bool = True
+        self._service_count: int = 0
+        self._active_count: int = 0
+        # Last value published per status tag (only changes are re-published)
+        self._published_tags: Dict[str, Any] = {}
+
+        # Managed unit files on disk (unit name → path), seeded by _scan_managed_units
+        self._unit_files: Dict[str, Path] = {}
+
+        # TagBus command dispatch (supervisor/_cmd/<command>)
+        self._cmd_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            "activate": self._cmd_activate,
+            "deactivate": self._cmd_deactivate,
+            "restart": self._cmd_restart,
+            "list": self._cmd_list,
+        }
+
         # Change detection
         self._last_license_check_ts: float = 0.0
+        self._last_healthcheck_ts: float = 0.0
 
-        # Cycle counter for TagBus command polling
-        self._cmd_poll_count: int = 0
+        # FSM thread heartbeat (gates WATCHDOG=1 sent from the manage loop)
+        self._fsm_progress_ts: float = time.monotonic()
 
 
     # ────────────────────────────────────────────────────────────
@@ -145,6 +251,10 @@ class SupervisorApp(App):
     # ────────────────────────────────────────────────────────────
 
     def on_prepare(self) -> None:
+        # systemctl is called directly (no sudo), so the unit must run as root
+        if os.geteuid() != 0:
+            raise PermissionError("supervisor must run as root (User=root)")
+
         # Open database
         self._db = EdgeDB(self._sv_conf.db_path)
         self._db.open()
@@ -158,15 +268,24 @@ class SupervisorApp(App):
         except Exception as exc:
             self.logger.warning(f"license manager unavailable: {exc}")
 
+        # Type=notify: report startup complete before any managed unit is
+        # started (their start jobs wait on ne-supervisor.service otherwise)
+        _sd_notify("READY=1")
+
     def on_configure(self) -> None:
         # Register addon apps that are known but not yet in registry
         self._ensure_addon_registry()
 
     def on_connect(self) -> None:
+        self._fsm_progress_ts = time.monotonic()
+
+        # New databus session: publish the full status again
+        self._published_tags.clear()
+        self._services_dirty = True
+
         # Subscribe to command tags
-        self.databus.sync_tags([f"{_TAG_CMD_PREFIX}/**"])
-        self.databus.set_on_tags_change(
-            [f"{_TAG_CMD_PREFIX}/**"], self._on_command_tag)
+        self.databus.sync_tags([_TAG_CMD_ALL])
+        self.databus.set_on_tags_change([_TAG_CMD_ALL], self._on_command_tag)
 
         # Subscribe to system tags for conn events
         self.databus.sync_tags([_TAG_SYS_CONN_ADDED, _TAG_SYS_CONN_REMOVED])
@@ -188,6 +307,7 @@ class SupervisorApp(App):
 
     def on_execute(self) -> None:
         now = time.monotonic()
+        self._fsm_progress_ts = now
 
         # Check license expiry
         if now - self._last_license_check_ts >= self._sv_conf.license_check_interval_s:
@@ -195,16 +315,31 @@ class SupervisorApp(App):
             self._check_license_expiry()
 
     def on_manage(self) -> None:
-        # Healthcheck
-        self._healthcheck()
+        now = time.monotonic()
+
+        # Keep systemd watchdog fed only while the FSM thread is moving
+        # (the manage loop runs on the main thread and outlives a hung FSM)
+        if now - self._fsm_progress_ts < self._sv_conf.watchdog_stall_s:
+            self._ping_watchdog()
+        else:
+            self.logger.error(
+                f"no fsm progress for {now - self._fsm_progress_ts:.0f}s, "
+                f"skipping watchdog ping")
+
+        # Healthcheck (own cadence, decoupled from the watchdog interval)
+        if now - self._last_healthcheck_ts >= self._sv_conf.healthcheck_interval_s:
+            self._last_healthcheck_ts = now
+            self._healthcheck()
 
         # Publish status to TagBus
         self._publish_status()
 
     def on_recover(self) -> None:
-        pass
+        self._fsm_progress_ts = time.monotonic()
 
     def on_disconnect(self) -> None:
+        self._fsm_progress_ts = time.monotonic()
+
         # Stop all managed services
         self._stop_all_services()
 
@@ -219,9 +354,7 @@ class SupervisorApp(App):
     # ────────────────────────────────────────────────────────────
 
     def _get_service_name(self, app_id: str, category: str) -> str:
-        if category == "interface":
-            return f"{_SVC_PREFIX_INTERFACE}-{app_id}"
-        return f"{_SVC_PREFIX_ADDON}-{app_id}"
+        return _service_name(app_id, category)
 
     def _get_service_path(self, app_id: str, category: str) -> Path:
         return _SYSTEMD_DIR / f"{self._get_service_name(app_id, category)}.service"
@@ -231,62 +364,116 @@ class SupervisorApp(App):
     # Systemd Operations
     # ────────────────────────────────────────────────────────────
 
-    def _systemctl(self, action: str, service: str) -> bool:
-        cmd = ["sudo", "systemctl", action, service]
+    def _systemctl(self, action: str, *services: str) -> bool:
+        # systemctl accepts several units per call (one fork for the batch)
+        import subprocess
+        cmd = ["systemctl", action, *services]
+        units = " ".join(services)
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             if result.returncode != 0:
                 self.logger.warning(
-                    f"systemctl {action} {service}: {result.stderr.strip()}")
+                    f"systemctl {action} {units}: {result.stderr.strip()}")
                 return False
             return True
         except Exception as exc:
-            self.logger.error(f"systemctl {action} {service} failed: {exc}")
+            self.logger.error(f"systemctl {action} {units} failed: {exc}")
             return False
 
+    def _ping_watchdog(self) -> None:
+        # Single place that sends WATCHDOG=1
+        _sd_notify("WATCHDOG=1")
+
     def _daemon_reload(self) -> bool:
-        return self._systemctl("daemon-reload", "")
+        return self._systemctl("daemon-reload")
 
-    def _is_service_active(self, app_id: str, category: str) -> bool:
-        svc = self._get_service_name(app_id, category)
-        cmd = ["sudo", "systemctl", "is-active", "--quiet", svc]
+    def _get_active_states(self, services: List[str]) -> Dict[str, bool]:
+        # is-active prints one state line per unit, in argument order
+        import subprocess
+        cmd = ["systemctl", "is-active", *services]
         try:
-            result = subprocess.run(cmd, capture_output=True, timeout=10)
-            return result.returncode == 0
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
         except Exception:
+            return dict.fromkeys(services, False)
+        lines = result.stdout.splitlines()
+        return {svc: i < len(lines) and lines[i] == "active"
+                for i, svc in enumerate(services)}
+
+    def _scan_managed_units(self) -> Dict[str, Path]:
+        prefixes = (f"{_SVC_PREFIX_INTERFACE}-", f"{_SVC_PREFIX_ADDON}-")
+        units: Dict[str, Path] = {}
+        try:
+            with os.scandir(_SYSTEMD_DIR) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith(prefixes) and name.endswith(".service"):
+                        units[name[:-len(".service")]] = Path(entry.path)
+        except OSError as exc:
+            self.logger.warning(f"scan units failed: {exc}")
+        return units
+
+    def _remove_orphan_units(self) -> bool:
+        """Stop and unlink units of apps no longer registered (caller runs daemon-reload)."""
+        known = {s.svc_name for s in self._services_snap}
+        orphans = [n for n in self._unit_files if n not in known]
+        if not orphans:
             return False
 
+        # Stop first (one batched call): a running unit whose file is gone can
+        # no longer be managed; on failure keep the files for the next sync
+        if not self._systemctl("stop", *orphans):
+            self.logger.warning(f"orphan units not removed (stop failed): {orphans}")
+            return False
+
+        removed = False
+        for name in orphans:
+            try:
+                self._unit_files.pop(name).unlink()
+                self.logger.info(f"removed orphan unit: {name}")
+                removed = True
+            except Exception as exc:
+                self.logger.error(f"remove orphan unit failed [{name}]: {exc}")
+        return removed
+
     def _create_service_unit(self, state: ServiceState) -> bool:
-        path = self._get_service_path(state.app_id, state.category)
+        """Write the unit file; True only if it changed (daemon-reload needed)."""
+        path = state.svc_path
 
         if state.category == "interface":
-            content = _INTERFACE_SERVICE_TEMPLATE.format(
-                app_id=state.app_id,
-                python=_VENV_PYTHON,
-                module=state.module,
-                conn_id=state.conn_id or state.app_id)
+            content = _render_interface_unit(state.app_id, state.module,
+                                             state.conn_id or state.app_id)
         else:
-            content = _ADDON_SERVICE_TEMPLATE.format(
-                app_id=state.app_id,
-                python=_VENV_PYTHON,
-                module=state.module)
+            content = _render_addon_unit(state.app_id, state.module)
+
+        # Identical unit already on disk: no write, no inode update, no reload
+        if state.svc_name in self._unit_files:
+            try:
+                with open(path, "rb") as f:
+                    if f.read() == content:
+                        return False
+            except OSError:
+                pass
+
         try:
-            path.write_text(content)
+            path.write_bytes(content)
+            self._unit_files[state.svc_name] = path
             return True
         except Exception as exc:
             self.logger.error(f"create unit failed [{state.app_id}]: {exc}")
             return False
 
     def _remove_service_unit(self, app_id: str, category: str) -> bool:
-        path = self._get_service_path(app_id, category)
-        if path.exists():
-            try:
-                path.unlink()
-                return True
-            except Exception as exc:
-                self.logger.error(f"remove unit failed [{app_id}]: {exc}")
-                return False
-        return True
+        path = self._unit_files.pop(self._get_service_name(app_id, category), None)
+        if path is None:
+            return True
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return True
+        except Exception as exc:
+            self.logger.error(f"remove unit failed [{app_id}]: {exc}")
+            return False
 
     def _start_service(self, app_id: str, category: str) -> bool:
         svc = self._get_service_name(app_id, category)
@@ -308,53 +495,107 @@ class SupervisorApp(App):
     # ────────────────────────────────────────────────────────────
 
     def _ensure_addon_registry(self) -> None:
-        for addon_id, module in ADDON_MODULES.items():
-            existing = self._db.select_app(addon_id)
-            if not existing:
-                self._db.upsert_app(addon_id, "addon", module, enabled=False)
-                self.logger.info(f"registered addon: {addon_id}")
+        # One lookup for all known addons, one transaction for the missing ones
+        existing = self._db.select_apps_in(ADDON_MODULES)
+        missing = [(addon_id, module) for addon_id, module in ADDON_MODULES.items()
+                   if addon_id not in existing]
+        if not missing:
+            return
+        self._db.upsert_apps_many(
+            [(addon_id, "addon", module, False, None) for addon_id, module in missing])
+        for addon_id, _ in missing:
+            self.logger.info(f"registered addon: {addon_id}")
 
     def _load_registry(self) -> None:
+        services = {}
+        for app_id, category, module, enabled, conn_id in self._db.select_app_services():
+            services[app_id] = ServiceState(
+                app_id=app_id,
+                category=category,
+                module=module,
+                enabled=bool(enabled),
+                conn_id=conn_id)
         with self._lock:
-            self._services.clear()
-            rows = self._db.select_app_registry()
-            for row in rows:
-                self._services[row["app_id"]] = ServiceState(
-                    app_id=row["app_id"],
-                    category=row["category"],
-                    module=row["module"],
-                    enabled=bool(row["enabled"]),
-                    conn_id=row["conn_id"])
+            self._services = services
+            self._update_services_snap()
 
     def _start_enabled_services(self) -> None:
         need_reload = False
-        with self._lock:
-            for state in self._services.values():
-                if not state.enabled:
-                    continue
-                if self._create_service_unit(state):
-                    need_reload = True
+        for state in self._services_snap:
+            if not state.enabled:
+                continue
+            if self._create_service_unit(state):
+                need_reload = True
 
         if need_reload:
             self._daemon_reload()
 
-        with self._lock:
-            for state in self._services.values():
-                if state.enabled:
+        targets = [s for s in self._services_snap if s.enabled]
+        if targets:
+            svcs = [s.svc_name for s in targets]
+            if self._systemctl("start", *svcs):
+                for state, svc in zip(targets, svcs):
+                    self._set_active(state, True)
+                    self.logger.info(f"started: {svc}")
+            else:
+                # Batch failed part-way: per-unit starts tell which ones succeeded
+                for state in targets:
+                    # Each unit may block up to the systemctl timeout; the FSM
+                    # thread is alive here, so keep WatchdogSec= from firing
+                    self._ping_watchdog()
                     if self._start_service(state.app_id, state.category):
-                        state.active = True
+                        self._set_active(state, True)
+        self._services_dirty = True
 
     def _stop_all_services(self) -> None:
-        with self._lock:
-            for state in self._services.values():
-                if state.active:
-                    self._stop_service(state.app_id, state.category)
-                    state.active = False
-            self.logger.info("stopped all managed services")
+        targets = [s for s in self._services_snap if s.active]
+        if targets:
+            # Stop is best effort at shutdown; one call for every unit
+            self._systemctl("stop", *[s.svc_name for s in targets])
+            for state in targets:
+                self._set_active(state, False)
+        self._services_dirty = True
+        self.logger.info("stopped all managed services")
 
     def _count_active(self) -> int:
+        return self._active_count
+
+    def _set_active(self, state: ServiceState, active: bool) -> None:
+        # Single place that flips state.active, so the count stays in step
         with self._lock:
-            return sum(1 for s in self._services.values() if s.active)
+            if state.active != active:
+                state.active = active
+                self._active_count += 1 if active else -1
+            # _healthcheck only observes active units, so clear running here
+            if not active:
+                state.running = False
+        self._services_dirty = True
+
+    def _put_services(self, states: List[ServiceState]) -> None:
+        # Copy-on-write insert: readers holding the old dict are unaffected
+        with self._lock:
+            services = dict(self._services)
+            for state in states:
+                services[state.app_id] = state
+            self._services = services
+            self._update_services_snap()
+
+    def _pop_service(self, app_id: str) -> None:
+        with self._lock:
+            if app_id not in self._services:
+                return
+            services = dict(self._services)
+            del services[app_id]
+            self._services = services
+            self._update_services_snap()
+
+    def _update_services_snap(self) -> None:
+        # Caller holds _lock; full recount only on insert/remove
+        snap = tuple(self._services.values())
+        self._services_snap = snap
+        self._service_count = len(snap)
+        self._active_count = sum(1 for s in snap if s.active)
+        self._services_dirty = True
 
 
     # ────────────────────────────────────────────────────────────
@@ -362,29 +603,37 @@ class SupervisorApp(App):
     # ────────────────────────────────────────────────────────────
 
     def _sync_conns_initial(self) -> None:
-        conns = self._db.select_conns_enabled()
+        # One directory scan instead of a stat per unit
+        self._unit_files = self._scan_managed_units()
+
         need_reload = False
 
-        for row in conns:
-            conn_id = row["conn"]
-            protocol = row["protocol"]
-            module = PROTOCOL_MODULES.get(protocol)
+        states: List[ServiceState] = []
+        protocol_module = PROTOCOL_MODULES.get
+        for conn_id, protocol in self._db.select_conn_protocols_enabled():
+            module = protocol_module(protocol)
             if not module:
                 self.logger.warning(
                     f"unknown protocol: {protocol} (conn={conn_id})")
                 continue
 
-            app_id = conn_id
-            self._db.upsert_app(app_id, "interface", module,
-                                enabled=True, conn_id=conn_id)
-            state = ServiceState(app_id=app_id, category="interface",
-                                 module=module, enabled=True, conn_id=conn_id)
-            with self._lock:
-                self._services[app_id] = state
+            states.append(ServiceState(app_id=conn_id, category="interface",
+                                       module=module, enabled=True, conn_id=conn_id))
+
+        # Single transaction for all registry upserts
+        self._db.upsert_apps_many(
+            [(s.app_id, s.category, s.module, True, s.conn_id) for s in states])
 
+        self._put_services(states)
+
+        for state in states:
             if self._create_service_unit(state):
                 need_reload = True
 
+        # Unit files left behind for apps no longer in the registry
+        if self._remove_orphan_units():
+            need_reload = True
+
         if need_reload:
             self._daemon_reload()
 
@@ -411,13 +660,13 @@ class SupervisorApp(App):
                             enabled=True, conn_id=conn_id)
         state = ServiceState(app_id=app_id, category="interface",
                              module=module, enabled=True, conn_id=conn_id)
-        with self._lock:
-            self._services[app_id] = state
+        self._put_services([state])
 
         if self._create_service_unit(state):
             self._daemon_reload()
         if self._start_service(app_id, "interface"):
-            state.active = True
+            self._set_active(state, True)
+        self._services_dirty = True
         self.logger.info(f"started new interface: {app_id} (prot={protocol})")
 
     def _on_conn_removed(self, tag_id: str, tag_data) -> None:
@@ -427,8 +676,7 @@ class SupervisorApp(App):
 
         self.logger.info(f"conn_removed event: {conn_id}")
         app_id = conn_id
-        with self._lock:
-            state = self._services.get(app_id)
+        state = self._services.get(app_id)
 
         if not state:
             self.logger.warning(f"conn_removed but service not found: {conn_id}")
@@ -438,8 +686,7 @@ class SupervisorApp(App):
         self._remove_service_unit(app_id, "interface")
         self._daemon_reload()
         self._db.delete_app(app_id)
-        with self._lock:
-            self._services.pop(app_id, None)
+        self._pop_service(app_id)
         self.logger.info(f"removed interface: {app_id}")
 
 
@@ -475,13 +722,13 @@ class SupervisorApp(App):
         # Create and start service
         state = ServiceState(app_id=app_id, category="addon",
                              module=module, enabled=True)
-        with self._lock:
-            self._services[app_id] = state
+        self._put_services([state])
 
         if self._create_service_unit(state):
             self._daemon_reload()
         if self._start_service(app_id, "addon"):
-            state.active = True
+            self._set_active(state, True)
+        self._services_dirty = True
 
         self.logger.info(f"addon activated: {app_id}")
 
@@ -490,56 +737,79 @@ class SupervisorApp(App):
         return {"ok": True, "app_id": app_id, "expires_at": expires_at}
 
     def deactivate_addon(self, app_id: str) -> Dict[str, Any]:
-        self._deactivate_service(app_id, "addon")
-        self._remove_service_unit(app_id, "addon")
+        self._teardown_addon(app_id)
         self._daemon_reload()
 
         # Update DB
         self._db.update_app_license(app_id, None, None, enabled=False)
 
+        self._finish_addon_deactivation(app_id)
+        return {"ok": True, "app_id": app_id}
+
+    def _teardown_addon(self, app_id: str) -> None:
+        # Stop the service and drop its unit (caller runs daemon-reload)
+        self._deactivate_service(app_id, "addon")
+        self._remove_service_unit(app_id, "addon")
+
+    def _finish_addon_deactivation(self, app_id: str) -> None:
         # Remove cached token
         if self._license_mgr:
             self._license_mgr.remove_cached_token(app_id)
 
-        with self._lock:
-            state = self._services.get(app_id)
-            if state:
-                state.enabled = False
-                state.active = False
+        state = self._services.get(app_id)
+        if state:
+            state.enabled = False
+            self._set_active(state, False)
 
         self.logger.info(f"addon deactivated: {app_id}")
         self._publish_event("addon_deactivated", app_id)
-        return {"ok": True, "app_id": app_id}
 
     def _check_license_expiry(self) -> None:
         if not self._license_mgr:
             return
 
+        # Expiry filter runs in SQL; only expired addon ids come back
         now = int(time.time())
-        addon_rows = self._db.select_app_registry("addon")
-        for row in addon_rows:
-            if not row["enabled"]:
-                continue
-            expires_at = row["license_expires_at"]
-            if expires_at and expires_at <= now:
-                self.logger.warning(
-                    f"license expired for addon: {row['app_id']}")
-                self.deactivate_addon(row["app_id"])
+        expired = self._db.select_expired_apps("addon", now)
+        if not expired:
+            return
+
+        for app_id in expired:
+            self.logger.warning(f"license expired for addon: {app_id}")
+            self._teardown_addon(app_id)
+        self._daemon_reload()
+
+        # One executemany + commit for every expired row
+        self._db.update_app_licenses_many(
+            [(app_id, None, None, False) for app_id in expired])
+
+        for app_id in expired:
+            self._finish_addon_deactivation(app_id)
 
     def _restore_addon_licenses(self) -> None:
         if not self._license_mgr:
             return
 
         cached_tokens = self._license_mgr.load_cached_tokens()
+        pending: Dict[str, str] = {}
         for app_id, token in cached_tokens.items():
-            existing = self._db.select_app(app_id)
-            if existing and not existing["enabled"]:
-                # Validate cached token
-                claims = self._license_mgr.validate_token(token)
-                if claims:
-                    self.activate_addon(app_id, token)
-                else:
-                    self._license_mgr.remove_cached_token(app_id)
+            if self._db.select_app_enabled(app_id) is False:
+                pending[app_id] = token
+        if not pending:
+            return
+
+        # Validate cached tokens concurrently (JWT signature check is the slow part)
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            claims_map = dict(zip(pending, executor.map(
+                self._license_mgr.validate_token, pending.values())))
+
+        # Activation touches DB/systemd, keep it serial
+        for app_id, claims in claims_map.items():
+            if claims:
+                self.activate_addon(app_id, pending[app_id])
+            else:
+                self._license_mgr.remove_cached_token(app_id)
 
 
     # ────────────────────────────────────────────────────────────
@@ -547,38 +817,29 @@ class SupervisorApp(App):
     # ────────────────────────────────────────────────────────────
 
     def _deactivate_service(self, app_id: str, category: str) -> None:
-        with self._lock:
-            state = self._services.get(app_id)
+        state = self._services.get(app_id)
         if state and state.active:
             self._stop_service(app_id, category)
-            state.active = False
+            self._set_active(state, False)
 
     def _healthcheck(self) -> None:
-        now = time.monotonic()
-        with self._lock:
-            for state in self._services.values():
-                if not state.enabled or not state.active:
-                    continue
-
-                if not self._is_service_active(state.app_id, state.category):
-                    # Reset counter if enough time has passed
-                    if now - state.last_restart_ts > _RESTART_COUNT_RESET_S:
-                        state.restart_count = 0
-
-                    if state.restart_count >= _MAX_RESTART_COUNT:
-                        self.logger.error(
-                            f"service exceeded max restarts: {state.app_id}")
-                        state.active = False
-                        continue
-
-                    self.logger.warning(
-                        f"service died, restarting: {state.app_id} "
-                        f"({state.restart_count + 1}/{_MAX_RESTART_COUNT})")
-                    if self._start_service(state.app_id, state.category):
-                        state.restart_count += 1
-                        state.last_restart_ts = now
-                    else:
-                        state.active = False
+        # Observe only; restarts are handled by systemd (Restart=, StartLimitBurst=)
+        # Snapshot iteration keeps _lock free; one systemctl call for all units
+        targets = [s for s in self._services_snap if s.enabled and s.active]
+        if not targets:
+            return
+        svcs = [s.svc_name for s in targets]
+        active_states = self._get_active_states(svcs)
+
+        for state, svc in zip(targets, svcs):
+            running = active_states[svc]
+            if running == state.running:
+                continue
+
+            state.running = running
+            self._services_dirty = True
+            if not running:
+                self.logger.warning(f"service not running: {state.app_id}")
 
 
     # ────────────────────────────────────────────────────────────
@@ -587,44 +848,50 @@ class SupervisorApp(App):
 
     def _on_command_tag(self, tag_id: str, tag_data) -> None:
         # Parse command from tag_id: supervisor/_cmd/<command>
-        parts = tag_id.split("/")
-        if len(parts) < 3:
+        if not tag_id.startswith(_CMD_PREFIX):
+            return
+
+        # Index math only: one slice for the command token, no split/partition
+        end = tag_id.find("/", _CMD_PREFIX_LEN)
+        command = tag_id[_CMD_PREFIX_LEN:end] if end >= 0 else tag_id[_CMD_PREFIX_LEN:]
+        handler = self._cmd_handlers.get(command)
+        if not handler:
             return
 
-        command = parts[2]
         try:
-            payload = json.loads(tag_data.v) if isinstance(tag_data.v, str) else {}
+            payload = _json_loads(tag_data.v) if isinstance(tag_data.v, str) else {}
         except (json.JSONDecodeError, TypeError):
             payload = {}
 
-        if command == "activate":
-            app_id = payload.get("app_id", "")
-            token = payload.get("token", "")
-            if app_id and token:
-                result = self.activate_addon(app_id, token)
-                self._publish_event("activate_result", json.dumps(result))
+        handler(payload)
 
-        elif command == "deactivate":
-            app_id = payload.get("app_id", "")
-            if app_id:
-                result = self.deactivate_addon(app_id)
-                self._publish_event("deactivate_result", json.dumps(result))
+    def _cmd_activate(self, payload: Dict[str, Any]) -> None:
+        app_id = payload.get("app_id", "")
+        token = payload.get("token", "")
+        if app_id and token:
+            result = self.activate_addon(app_id, token)
+            self._publish_event("activate_result", _json_dumps(result))
 
-        elif command == "restart":
-            app_id = payload.get("app_id", "")
-            self._restart_managed_service(app_id)
+    def _cmd_deactivate(self, payload: Dict[str, Any]) -> None:
+        app_id = payload.get("app_id", "")
+        if app_id:
+            result = self.deactivate_addon(app_id)
+            self._publish_event("deactivate_result", _json_dumps(result))
 
-        elif command == "list":
-            self._publish_event("service_list", json.dumps(self._get_service_list()))
+    def _cmd_restart(self, payload: Dict[str, Any]) -> None:
+        app_id = payload.get("app_id", "")
+        self._restart_managed_service(app_id)
+
+    def _cmd_list(self, payload: Dict[str, Any]) -> None:
+        self._publish_event("service_list", _json_dumps(self._get_service_list()))
 
     def _restart_managed_service(self, app_id: str) -> None:
-        with self._lock:
-            state = self._services.get(app_id)
+        state = self._services.get(app_id)
         if not state:
             return
-        self._stop_service(app_id, state.category)
-        if self._start_service(app_id, state.category):
-            state.active = True
+        # systemctl restart = stop + start in one process (starts it if stopped)
+        if self._systemctl("restart", state.svc_name):
+            self._set_active(state, True)
         self.logger.info(f"restarted: {app_id}")
 
 
@@ -634,35 +901,44 @@ class SupervisorApp(App):
 
     def _get_service_list(self) -> Dict[str, Any]:
         result = {}
-        with self._lock:
-            for app_id, state in self._services.items():
-                result[app_id] = {
-                    "category": state.category,
-                    "enabled": state.enabled,
-                    "active": state.active,
-                    "restart_count": state.restart_count,
-                }
+        for state in self._services_snap:
+            result[state.app_id] = {
+                "category": state.category,
+                "enabled": state.enabled,
+                "active": state.active,
+                "running": state.running,
+            }
         return result
 
     def _publish_status(self) -> None:
         if not self.databus:
             return
 
-        svc_list = self._get_service_list()
-        active_count = sum(1 for s in svc_list.values() if s["active"])
-
-        self.databus.set_tags({
-            f"{_TAG_META_PREFIX}/state":
-                self.current_state.name if self.current_state else "None",
-            f"{_TAG_META_PREFIX}/service_count": len(svc_list),
-            f"{_TAG_META_PREFIX}/active_count": active_count,
-            f"{_TAG_META_PREFIX}/services": json.dumps(svc_list),
-            f"{_TAG_META_PREFIX}/exception_count": self.stats.exception_count,
-        })
+        tags: Dict[str, Any] = {
+            _TAG_META_STATE: self.current_state.name if self.current_state else "None",
+            _TAG_META_EXCEPTION_COUNT: self.stats.exception_count,
+        }
+
+        # Rebuild the service list only after a ServiceState change
+        if self._services_dirty:
+            self._services_dirty = False
+            tags[_TAG_META_SERVICES] = _json_dumps(self._get_service_list())
+
+        tags[_TAG_META_SERVICE_COUNT] = self._service_count
+        tags[_TAG_META_ACTIVE_COUNT] = self._active_count
+
+        # Publish only tags whose value changed since the last publish
+        published = self._published_tags
+        changed = {tag: value for tag, value in tags.items()
+                   if tag not in published or published[tag] != value}
+        if not changed:
+            return
+        published.update(changed)
+        self.databus.set_tags(changed)
         self.databus.commit()
 
     def _publish_event(self, event: str, data: Any = None) -> None:
         if not self.databus:
             return
-        self.databus.set_tags({f"{_TAG_EVENT_PREFIX}/{event}": data})
+        self.databus.set_tags({_event_tag(event): data})
         self.databus.commit()
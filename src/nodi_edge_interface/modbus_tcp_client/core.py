@@ -2,11 +2,84 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 from nodi_edge.app import AppConfig
 from nodi_edge.interface_app import InterfaceApp
 
+# Optional fast JSON decoder
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Constants
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# Per-request read limits (Modbus spec): coils/discrete inputs, registers
+_MAX_READ_COUNT: Dict[int, int] = {1: 2000, 2: 2000, 3: 125, 4: 125}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Types
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@dataclass(**_DATACLASS_SLOTS)
+class ModbusGroups:
+    """Per-block Modbus settings as parallel columns (index = block position)."""
+    block_ids: List[str] = field(default_factory=list)
+    directions: List[str] = field(default_factory=list)
+    unit_ids: array = field(default_factory=lambda: array("B"))
+    func_codes: array = field(default_factory=lambda: array("B"))
+    # (unit_id, func_code) → block indices; one Modbus request group per key
+    requests: Dict[Tuple[int, int], List[int]] = field(default_factory=dict)
+    # (unit_id, func_code) → coalesced (start, count) reads for read FCs
+    reads: Dict[Tuple[int, int], List[Tuple[int, int]]] = field(default_factory=dict)
+    # Block index → (read index in its bucket, offset in that read's result)
+    read_slots: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.block_ids)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Helpers
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _is_byte(value: Any) -> bool:
+    # unit_id/func_code are single bytes on the wire (bool is not a valid code)
+    return type(value) is int and 0 <= value <= 255
+
+
+def _coalesce_reads(ranges: List[Tuple[int, int, int]],
+                    max_count: int) -> Tuple[List[Tuple[int, int]], Dict[int, Tuple[int, int]]]:
+    """Merge (address, count, block_index) ranges into as few reads as possible.
+
+    Adjacent or overlapping ranges share a read while it stays within
+    max_count; gaps are never bridged (unmapped addresses can fault).
+    """
+    reads: List[Tuple[int, int]] = []
+    slots: Dict[int, Tuple[int, int]] = {}
+    run_start = run_end = -1
+    for address, count, block_idx in sorted(ranges):
+        end = address + count
+        if reads and address <= run_end and max(run_end, end) - run_start <= max_count:
+            run_end = max(run_end, end)
+            reads[-1] = (run_start, run_end - run_start)
+        else:
+            run_start, run_end = address, end
+            reads.append((address, count))
+        slots[block_idx] = (len(reads) - 1, address - run_start)
+    return reads, slots
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ModbusTcpClientApp
@@ -23,7 +96,9 @@ class ModbusTcpClientApp(InterfaceApp):
 
         # Protocol state
         self._agent = None
-        self._modbus_groups: List[Dict[str, Any]] = []
+        self._modbus_groups = ModbusGroups()
+        # Parsed block properties by JSON text (reused across config reloads)
+        self._props_cache: Dict[str, Dict[str, Any]] = {}
 
     def on_interface_prepare(self) -> None:
         # Parse block properties into Modbus unit/fc groups
@@ -58,13 +133,50 @@ class ModbusTcpClientApp(InterfaceApp):
     # ────────────────────────────────────────────────────────────
 
     def _parse_modbus_groups(self) -> None:
-        self._modbus_groups.clear()
+        groups = ModbusGroups()
+        block_ids = groups.block_ids
+        directions = groups.directions
+        unit_ids = groups.unit_ids
+        func_codes = groups.func_codes
+        requests = groups.requests
+        ranges: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+        prev_cache = self._props_cache
+        props_cache: Dict[str, Dict[str, Any]] = {}
         for block in self._block_configs:
-            props = json.loads(block.get("properties", "{}"))
-            self._modbus_groups.append({
-                "block_id": block["block"],
-                "direction": block["direction"],
-                "unit_id": props.get("unit_id", 1),
-                "func_code": props.get("func_code", 3),
-            })
-        self._logger.info(f"parsed {len(self._modbus_groups)} modbus groups")
+            text = block.get("properties", "{}")
+            props = props_cache.get(text)
+            if props is None:
+                props = prev_cache.get(text)
+                if props is None:
+                    props = _json_loads(text)
+                props_cache[text] = props
+            unit_id = props.get("unit_id", 1)
+            func_code = props.get("func_code", 3)
+            # Validate before any bucket is touched (array("B") raises on bad values)
+            if not (_is_byte(unit_id) and _is_byte(func_code)):
+                self._logger.warning(
+                    f"skipping block {block.get('block')}: invalid unit_id={unit_id!r} "
+                    f"or func_code={func_code!r}")
+                continue
+            block_idx = len(block_ids)
+            requests.setdefault((unit_id, func_code), []).append(block_idx)
+            address = props.get("address")
+            if address is not None and func_code in _MAX_READ_COUNT:
+                ranges.setdefault((unit_id, func_code), []).append(
+                    (address, props.get("count", 1), block_idx))
+            block_ids.append(block["block"])
+            directions.append(block["direction"])
+            unit_ids.append(unit_id)
+            func_codes.append(func_code)
+
+        # Coalesce read ranges once here; execute replays the plan each cycle
+        for key, key_ranges in ranges.items():
+            reads, slots = _coalesce_reads(key_ranges, _MAX_READ_COUNT[key[1]])
+            groups.reads[key] = reads
+            groups.read_slots.update(slots)
+
+        # Only entries for current blocks survive (cache stays bounded)
+        self._props_cache = props_cache
+        self._modbus_groups = groups
+        self._logger.info(
+            f"parsed {len(groups)} modbus blocks in {len(requests)} request groups")
@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import argparse
+import signal
 import sys
 import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from nodi_edge.app import AppConfig, _AbsTimer
 from nodi_edge.states import AppState
 
 
@@ -56,6 +59,15 @@ class TestCliArgs:
         assert app._cli_args.clean is True
         assert app._cli_args.debug is True
 
+    def test_unknown_args_ignored(self):
+        """Verify unknown args are ignored and --conn-id=value is accepted."""
+        test_args = ["prog", "--verbose", "--conn-id=conn-7", "extra"]
+        with patch.object(sys, "argv", test_args):
+            app = _create_app()
+        assert app._cli_args.conn_id == "conn-7"
+        assert app._cli_args.clean is False
+        assert app._cli_args.debug is False
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Tests - FSM Transitions
@@ -92,6 +104,13 @@ class TestFsmTransitions:
         assert transitions[AppState.RECOVER] == [AppState.EXECUTE, AppState.DISCONNECT]
         assert transitions[AppState.DISCONNECT] == [AppState.CONNECT]
 
+    def test_state_formats_by_name(self):
+        """Verify str() and f-strings show the state name, not the int value."""
+        assert str(AppState.EXECUTE) == "AppState.EXECUTE"
+        assert f"{AppState.EXECUTE}" == "AppState.EXECUTE"
+        assert f"state: {AppState.CONNECT} -> {AppState.EXECUTE}" == \
+            "state: AppState.CONNECT -> AppState.EXECUTE"
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Tests - Reconfigure
@@ -125,3 +144,130 @@ class TestReconfigure:
         app.request_reconfigure()
         app.request_reconfigure()
         assert app._reconfigure_event.is_set()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Tests - Moving Average
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class TestMovingAverage:
+
+    def test_mean_empty(self):
+        """Verify mean is 0.0 before any sample."""
+        from nodi_edge.app import MovingAverage
+        assert MovingAverage(size=3).mean == 0.0
+
+    def test_mean_partial_window(self):
+        """Verify mean covers only the samples added so far."""
+        from nodi_edge.app import MovingAverage
+        maf = MovingAverage(size=4)
+        maf.add(1.0)
+        maf.add(2.0)
+        assert maf.mean == 1.5
+
+    def test_mean_wraps_window(self):
+        """Verify oldest samples drop out once the window is full."""
+        from nodi_edge.app import MovingAverage
+        maf = MovingAverage(size=3, decimal=2)
+        for sample in (1.0, 2.0, 3.0, 4.0, 5.0):
+            maf.add(sample)
+        assert maf.mean == 4.0
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Tests - Absolute Timer
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class TestAbsTimer:
+
+    def test_short_interval_uses_abs_timer(self):
+        """Verify execute intervals below 50 ms use the absolute timer."""
+        with patch.object(sys, "argv", ["prog"]):
+            app = _create_app(app_config=AppConfig(execute_interval_s=0.01))
+        assert isinstance(app._execute_timer, _AbsTimer)
+        app._execute_timer.close()
+
+    def test_stop_closes_timer_only_after_fsm_thread_exits(self):
+        """Verify _stop leaves the timerfd open while the FSM thread still runs."""
+        with patch.object(sys, "argv", ["prog"]):
+            app = _create_app(app_config=AppConfig(execute_interval_s=0.01))
+        real_timer = app._execute_timer
+        app._execute_timer = MagicMock(spec=_AbsTimer)
+        app._databus = None
+
+        release = threading.Event()
+        fsm_thread = threading.Thread(target=release.wait)
+        fsm_thread.start()
+        app._fsm_thread = fsm_thread
+        try:
+            app._stop()
+            app._execute_timer.close.assert_not_called()
+        finally:
+            release.set()
+            fsm_thread.join()
+
+        app._stop()
+        app._execute_timer.close.assert_called_once_with()
+        real_timer.close()
+
+    def test_wait_advances_grid(self):
+        """Verify wait() blocks until the deadline and advances by one period."""
+        timer = _AbsTimer(0.01)
+        try:
+            deadline_ns = timer._deadline_ns
+            timer.wait()
+            assert time.monotonic_ns() >= deadline_ns
+            assert timer._deadline_ns == deadline_ns + timer._period_ns
+        finally:
+            timer.close()
+
+    def test_missed_deadline_snaps_forward(self):
+        """Verify a missed deadline skips to the next grid point without sleeping."""
+        timer = _AbsTimer(0.01)
+        try:
+            timer._deadline_ns = time.monotonic_ns() - 25_000_000
+            start_ns = timer._deadline_ns
+            timer.wait()
+            assert timer._deadline_ns == start_ns + 3 * timer._period_ns
+        finally:
+            timer.close()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Tests - Manage Interval Timer
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class TestManageItimer:
+
+    @pytest.mark.skipif(not hasattr(signal, "setitimer"),
+                        reason="setitimer not available")
+    def test_manage_runs_on_alarm_ticks(self):
+        """Verify on_manage runs once per SIGALRM tick until the FSM stops."""
+        with patch.object(sys, "argv", ["prog"]):
+            app = _create_app(app_config=AppConfig(manage_interval_s=0.01))
+
+        app._fsm = MagicMock(is_running=True)
+        calls = []
+
+        def on_manage():
+            calls.append(1)
+            if len(calls) == 3:
+                app._fsm.is_running = False
+
+        app.on_manage = on_manage
+        app._run_manage_itimer()
+
+        assert len(calls) == 3
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+    def test_start_uses_periodic_timer_by_default(self):
+        """Verify start() only arms the itimer when manage_itimer is set."""
+        for manage_itimer in (False, True):
+            with patch.object(sys, "argv", ["prog"]):
+                app = _create_app(app_config=AppConfig(manage_itimer=manage_itimer))
+            app._fsm = MagicMock(is_running=False)
+            app._run_manage_itimer = MagicMock()
+            with patch("signal.signal"):
+                app.start()
+            itimer_used = app._run_manage_itimer.called
+            assert itimer_used is (manage_itimer and hasattr(signal, "setitimer"))
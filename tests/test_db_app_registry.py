@@ -67,3 +67,136 @@ def test_upsert_app_update_conn_id(mem_db):
 
     row = db.select_app("mtc-01")
     assert row["conn_id"] == "conn-new"
+
+
+# upsert_apps_many
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_upsert_apps_many(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    db.upsert_app(
+        app_id="mtc-01",
+        category="interface",
+        module="old.module",
+        conn_id="mtc-01")
+
+    db.upsert_apps_many([
+        ("mtc-01", "interface", "nodi_edge_interface.modbus_tcp_client", True, "mtc-01"),
+        ("ouc-01", "interface", "nodi_edge_interface.opcua_client", True, "ouc-01"),
+    ])
+
+    rows = db.select_app_registry("interface")
+    assert [r["app_id"] for r in rows] == ["mtc-01", "ouc-01"]
+    assert rows[0]["module"] == "nodi_edge_interface.modbus_tcp_client"
+    assert rows[0]["enabled"] == 1
+    assert rows[1]["conn_id"] == "ouc-01"
+
+
+def test_upsert_apps_many_empty(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    db.upsert_apps_many([])
+    assert db.select_app_registry() == []
+
+
+# transaction / update_app_licenses_many
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_transaction_rolls_back_on_error(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    try:
+        with db.transaction():
+            db.upsert_app(app_id="addon-01", category="addon", module="m")
+            assert db._in_tx
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    assert not db._in_tx
+    assert db.select_app("addon-01") is None
+
+
+def test_transaction_commits_grouped_writes(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    with db.transaction():
+        db.upsert_app(app_id="addon-01", category="addon", module="m")
+        db.update_app_enabled("addon-01", True)
+
+    mem_db.rollback()
+    row = db.select_app("addon-01")
+    assert row is not None
+    assert row["enabled"] == 1
+
+
+def test_update_app_licenses_many(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    db.upsert_apps_many([
+        ("vplc", "addon", "nodi_edge_addon.virtual_plc", False, None),
+        ("snf", "addon", "nodi_edge_addon.store_forward", False, None),
+    ])
+    db.update_app_licenses_many([
+        ("vplc", "token-a", 100, True),
+        ("snf", None, None, False),
+    ])
+
+    vplc = db.select_app("vplc")
+    assert vplc["license_token"] == "token-a"
+    assert vplc["license_expires_at"] == 100
+    assert vplc["enabled"] == 1
+    assert db.select_app("snf")["license_token"] is None
+
+
+def test_select_app_enabled(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    db.upsert_app("on-01", "addon", "nodi_edge_addon.on", enabled=True)
+    db.upsert_app("off-01", "addon", "nodi_edge_addon.off", enabled=False)
+
+    assert db.select_app_enabled("on-01") is True
+    assert db.select_app_enabled("off-01") is False
+    assert db.select_app_enabled("missing") is None
+
+
+def test_select_app_services_and_expired(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    db.upsert_app("mtc-01", "interface", "nodi_edge_interface.mtc",
+                  enabled=True, conn_id="mtc-01")
+    db.upsert_app("vplc", "addon", "nodi_edge_addon.vplc", enabled=True,
+                  license_token="t", license_expires_at=100)
+    db.upsert_app("hist", "addon", "nodi_edge_addon.hist", enabled=True,
+                  license_token="t", license_expires_at=0)
+    db.upsert_app("off", "addon", "nodi_edge_addon.off", enabled=False,
+                  license_token="t", license_expires_at=100)
+
+    assert db.select_app_services() == [
+        ("hist", "addon", "nodi_edge_addon.hist", 1, None),
+        ("mtc-01", "interface", "nodi_edge_interface.mtc", 1, "mtc-01"),
+        ("off", "addon", "nodi_edge_addon.off", 0, None),
+        ("vplc", "addon", "nodi_edge_addon.vplc", 1, None)]
+
+    # 0 means no expiry; disabled apps are skipped
+    assert db.select_expired_apps("addon", 200) == ["vplc"]
+    assert db.select_expired_apps("addon", 50) == []
+
+
+def test_select_apps_in(mem_db):
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    db.upsert_app("vplc", "addon", "nodi_edge_addon.vplc")
+    db.upsert_app("hist", "addon", "nodi_edge_addon.hist")
+
+    assert db.select_apps_in(["vplc", "missing", "hist"]) == {"vplc", "hist"}
+    assert db.select_apps_in([]) == set()
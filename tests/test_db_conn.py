@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import sys
+import threading
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -9,6 +10,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from nodi_edge.db import EdgeDB
 
 
+# open / close
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_close_from_other_thread_when_not_same_thread(tmp_path):
+    db = EdgeDB(str(tmp_path / "edge.db"), check_same_thread=False)
+    opener = threading.Thread(target=db.open)
+    opener.start()
+    opener.join()
+
+    db.close()
+    assert db._conn is None
+
+
 # select_conns
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -28,6 +42,18 @@ def test_select_conns_returns_all_ordered(mem_db):
     assert rows[1]["conn"] == "conn-b"
 
 
+def test_select_conn_protocols_enabled(mem_db):
+    mem_db.executemany(
+        "INSERT INTO conns (conn, protocol, use) VALUES (?, ?, ?)",
+        [("conn-b", "mtc", 1), ("conn-a", "ouc", 1), ("conn-c", "mtc", 0)])
+    mem_db.commit()
+
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    assert db.select_conn_protocols_enabled() == [("conn-a", "ouc"), ("conn-b", "mtc")]
+
+
 def test_select_conns_empty(mem_db):
     db = EdgeDB.__new__(EdgeDB)
     db._conn = mem_db
@@ -166,3 +192,47 @@ def test_select_blocks_tags_by_block_empty(mem_db):
 
     rows = db.select_blocks_tags_by_block("no-such-block")
     assert rows == []
+
+
+def test_select_prot_prop_mapping_cached(mem_db):
+    mem_db.execute(
+        "CREATE TABLE IF NOT EXISTS prot_prop ("
+        "prot TEXT, layer TEXT, pos INTEGER, key TEXT, type TEXT, label TEXT)")
+    mem_db.execute(
+        "INSERT INTO prot_prop VALUES (?, ?, ?, ?, ?, ?)",
+        ("mtc", "block", 0, "unit_id", "int", "Unit ID"))
+    mem_db.commit()
+
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    mapping = db.select_prot_prop_mapping("mtc", "block")
+    assert dict(mapping) == {0: ("unit_id", "int")}
+    assert db.select_prot_prop_labels("mtc", "block") == {0: ("unit_id", "Unit ID")}
+
+    # Served from cache until reload_schema()
+    mem_db.execute("UPDATE prot_prop SET type = 'str'")
+    assert db.select_prot_prop_mapping("mtc", "block") is mapping
+    db.reload_schema()
+    assert db.select_prot_prop_mapping("mtc", "block") == {0: ("unit_id", "str")}
+
+
+def test_select_prot_prop_all(mem_db):
+    mem_db.execute(
+        "CREATE TABLE IF NOT EXISTS prot_prop ("
+        "prot TEXT, layer TEXT, pos INTEGER, key TEXT, type TEXT, label TEXT)")
+    mem_db.executemany(
+        "INSERT INTO prot_prop VALUES (?, ?, ?, ?, ?, ?)",
+        [("mtc", "block", 1, "func_code", "int", "Function"),
+         ("mtc", "block", 0, "unit_id", "int", "Unit ID")])
+    mem_db.commit()
+
+    db = EdgeDB.__new__(EdgeDB)
+    db._conn = mem_db
+
+    assert db.select_prot_prop_all("mtc", "block") == (
+        (0, "unit_id", "int", "Unit ID"),
+        (1, "func_code", "int", "Function"))
+    assert db.select_prot_prop_labels("mtc", "block") == {
+        0: ("unit_id", "Unit ID"), 1: ("func_code", "Function")}
+    assert db.select_prot_prop_all("mtc", "other") == ()
@@ -9,10 +9,10 @@ from unittest.mock import patch
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from nodi_edge_apps.supervisor.core import _INTERFACE_SERVICE_TEMPLATE, _VENV_PYTHON
+from nodi_edge_apps.supervisor.core import _render_interface_unit, _VENV_PYTHON
 
 from nodi_edge.db import EdgeDB, PROTOCOL_MODULES
-from nodi_edge.interface_app import InterfaceApp
+from nodi_edge.interface_app import ConnConfig, InterfaceApp
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -63,11 +63,10 @@ def test_full_flow_db_to_service_file(mem_db):
     assert module == "nodi_edge_interface.modbus_tcp_client"
 
     # Format service template
-    content = _INTERFACE_SERVICE_TEMPLATE.format(
+    content = _render_interface_unit(
         app_id="mtc-01",
-        python=_VENV_PYTHON,
         module=module,
-        conn_id="mtc-01")
+        conn_id="mtc-01").decode()
 
     # Verify key fields in generated service file
     assert "--conn-id=mtc-01" in content
@@ -143,6 +142,17 @@ def test_conn_info_change_detection():
     assert InterfaceApp._is_conn_info_changed(base, changed) is True
 
 
+def test_conn_config_from_conn():
+    row = {"conn": "mtc-01", "host": "10.0.0.1", "port": 502,
+           "timeout": 3.0, "retry": 3, "properties": "{}"}
+    info = ConnConfig.from_conn(row)
+    assert info == ConnConfig("10.0.0.1", 502, 3.0, 3)
+
+    # Non-connection columns do not affect equality
+    assert ConnConfig.from_conn(dict(row, properties='{"x": 1}')) == info
+    assert ConnConfig.from_conn(dict(row, retry=5)) != info
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Test: Multiple Connections / Multiple Protocols
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
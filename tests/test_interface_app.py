@@ -85,6 +85,24 @@ class TestConfigLoading:
         assert app._block_configs[0]["block"] == "blk-01"
         assert app._block_configs[1]["block"] == "blk-02"
 
+    def test_db_kept_open_across_disconnect(self):
+        """Verify on_disconnect keeps the DB and on_prepare does not reopen it."""
+        app = _create_interface_app()
+        app._load_config = MagicMock()
+
+        with patch("nodi_edge.interface_app.EdgeDB") as mock_edge_db, \
+             patch("nodi_edge.interface_app.atexit") as mock_atexit:
+            app.on_prepare()
+            db = app._db
+            app.on_disconnect()
+            app.on_prepare()
+
+        assert app._db is db
+        mock_edge_db.assert_called_once_with(check_same_thread=False)
+        db.open.assert_called_once()
+        db.close.assert_not_called()
+        mock_atexit.register.assert_called_once_with(db.close)
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Tests - Connection Info Change Detection
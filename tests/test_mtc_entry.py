@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+from unittest.mock import MagicMock
+
+from nodi_edge_interface.modbus_tcp_client.core import (
+    ModbusGroups,
+    ModbusTcpClientApp,
+    _coalesce_reads,
+)
+
 
 def test_mtc_module_importable():
     from nodi_edge_interface.modbus_tcp_client.core import ModbusTcpClientApp
@@ -27,3 +35,88 @@ def test_mtc_main_module_exists():
     mod = importlib.import_module("nodi_edge_interface.modbus_tcp_client.__main__")
     assert hasattr(mod, "_APP_ID")
     assert mod._APP_ID == "mtc"
+
+
+def _make_mtc_app(block_configs):
+    app = ModbusTcpClientApp.__new__(ModbusTcpClientApp)
+    app._logger = MagicMock()
+    app._modbus_groups = ModbusGroups()
+    app._props_cache = {}
+    app._block_configs = block_configs
+    return app
+
+
+def test_mtc_parse_modbus_groups_reuses_parsed_properties():
+    props = '{"unit_id": 2, "func_code": 4}'
+    app = _make_mtc_app([
+        {"block": "blk-01", "direction": "in", "properties": props},
+        {"block": "blk-02", "direction": "out", "properties": "{}"},
+    ])
+
+    app._parse_modbus_groups()
+    groups = app._modbus_groups
+    assert groups.block_ids == ["blk-01", "blk-02"]
+    assert list(groups.unit_ids) == [2, 1]
+    assert list(groups.func_codes) == [4, 3]
+    parsed = app._props_cache[props]
+
+    # Reload with one block removed: cached parse reused, stale entry dropped
+    app._block_configs = app._block_configs[:1]
+    app._parse_modbus_groups()
+    assert app._props_cache == {props: parsed}
+    assert app._props_cache[props] is parsed
+
+
+def test_mtc_parse_modbus_groups_buckets_requests():
+    app = _make_mtc_app([
+        {"block": "blk-01", "direction": "in", "properties": '{"unit_id": 1}'},
+        {"block": "blk-02", "direction": "in", "properties": '{"func_code": 4}'},
+        {"block": "blk-03", "direction": "in", "properties": "{}"},
+    ])
+
+    app._parse_modbus_groups()
+    assert len(app._modbus_groups) == 3
+    assert app._modbus_groups.requests == {(1, 3): [0, 2], (1, 4): [1]}
+
+
+def test_mtc_coalesce_reads_merges_adjacent_within_limit():
+    # blk 0: 0-9, blk 1: 10-19 (adjacent), blk 2: 15-24 (overlap), blk 3: 40-41 (gap)
+    reads, slots = _coalesce_reads(
+        [(10, 10, 1), (0, 10, 0), (40, 2, 3), (15, 10, 2)], max_count=125)
+    assert reads == [(0, 25), (40, 2)]
+    assert slots == {0: (0, 0), 1: (0, 10), 2: (0, 15), 3: (1, 0)}
+
+    # Limit splits an otherwise contiguous run
+    reads, slots = _coalesce_reads([(0, 100, 0), (100, 50, 1)], max_count=125)
+    assert reads == [(0, 100), (100, 50)]
+    assert slots == {0: (0, 0), 1: (1, 0)}
+
+
+def test_mtc_parse_modbus_groups_plans_reads():
+    app = _make_mtc_app([
+        {"block": "blk-01", "direction": "in", "properties": '{"address": 0, "count": 8}'},
+        {"block": "blk-02", "direction": "in", "properties": '{"address": 8, "count": 4}'},
+        {"block": "blk-03", "direction": "out",
+         "properties": '{"func_code": 16, "address": 100, "count": 2}'},
+    ])
+
+    app._parse_modbus_groups()
+    groups = app._modbus_groups
+    assert groups.reads == {(1, 3): [(0, 12)]}
+    assert groups.read_slots == {0: (0, 0), 1: (0, 8)}
+
+
+def test_mtc_parse_modbus_groups_skips_invalid_unit_or_func_code():
+    app = _make_mtc_app([
+        {"block": "blk-01", "direction": "in", "properties": '{"unit_id": 256}'},
+        {"block": "blk-02", "direction": "in", "properties": '{"func_code": -1}'},
+        {"block": "blk-03", "direction": "in", "properties": '{"unit_id": "1"}'},
+        {"block": "blk-04", "direction": "in", "properties": '{"address": 0, "count": 2}'},
+    ])
+
+    app._parse_modbus_groups()
+    groups = app._modbus_groups
+    assert groups.block_ids == ["blk-04"]
+    assert groups.requests == {(1, 3): [0]}
+    assert groups.reads == {(1, 3): [(0, 2)]}
+    assert app._logger.warning.call_count == 3
@@ -1,33 +1,59 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import socket
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nodi_edge.app import AppStatistics
 from nodi_edge_apps.supervisor.core import (
-    _INTERFACE_SERVICE_TEMPLATE, _VENV_PYTHON, _SVC_PREFIX_INTERFACE,
-    _TAG_SYS_CONN_ADDED, _TAG_SYS_CONN_REMOVED, ServiceState
+    _render_addon_unit, _render_interface_unit, _VENV_PYTHON, _SVC_PREFIX_INTERFACE,
+    _TAG_SYS_CONN_ADDED, _TAG_SYS_CONN_REMOVED, ServiceState, SupervisorApp,
+    _sd_notify
 )
 
 
-# _INTERFACE_SERVICE_TEMPLATE
+# _render_interface_unit
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 def test_interface_service_template_uses_conn_id():
-    content = _INTERFACE_SERVICE_TEMPLATE.format(
+    content = _render_interface_unit(
         app_id="mtc-01",
-        python=_VENV_PYTHON,
         module="nodi_edge_interface.modbus_tcp_client",
-        conn_id="mtc-01")
+        conn_id="mtc-01").decode()
     assert "--conn-id=mtc-01" in content
 
 
 def test_interface_service_template_uses_restart_always():
-    content = _INTERFACE_SERVICE_TEMPLATE.format(
+    content = _render_interface_unit(
         app_id="test-app",
-        python=_VENV_PYTHON,
         module="nodi_edge_interface.modbus_tcp_client",
-        conn_id="test-app")
+        conn_id="test-app").decode()
     assert "Restart=always" in content
 
 
+def test_addon_service_template_has_no_conn_id():
+    content = _render_addon_unit(
+        app_id="vplc",
+        module="nodi_edge_addon.virtual_plc").decode()
+    assert f"ExecStart={_VENV_PYTHON} -m nodi_edge_addon.virtual_plc\n" in content
+    assert "--conn-id" not in content
+    assert "Restart=on-failure" in content
+
+
+def test_start_limit_keys_are_in_unit_section():
+    # systemd ignores StartLimit* under [Service]
+    for content in (_render_interface_unit("mtc-01", "m", "mtc-01").decode(),
+                    _render_addon_unit("vplc", "m").decode()):
+        unit, _, service = content.partition("[Service]")
+        assert "StartLimitIntervalSec=300\n" in unit
+        assert "StartLimitBurst=5\n" in unit
+        assert "StartLimit" not in service
+
+
 # System Tag Constants
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -59,6 +85,20 @@ def test_service_state_conn_id_defaults_none():
     assert state.conn_id is None
 
 
+def test_service_state_rejects_ad_hoc_attributes():
+    if sys.version_info < (3, 10):
+        pytest.skip("dataclass slots require Python 3.10+")
+
+    state = ServiceState(
+        app_id="vplc",
+        category="addon",
+        module="nodi_edge_addon.virtual_plc",
+        enabled=True)
+    assert not hasattr(state, "__dict__")
+    with pytest.raises(AttributeError):
+        state.unknown = 1
+
+
 # Service Naming
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -69,3 +109,451 @@ def test_service_name_pattern():
     app_id = "mtc-01"
     expected = f"ne-interface-{app_id}"
     assert expected == f"{_SVC_PREFIX_INTERFACE}-{app_id}"
+
+
+def test_service_state_derives_unit_name_and_path():
+    state = ServiceState(
+        app_id="mtc-01",
+        category="interface",
+        module="nodi_edge_interface.modbus_tcp_client",
+        enabled=True)
+    assert state.svc_name == "ne-interface-mtc-01"
+    assert state.svc_path.name == "ne-interface-mtc-01.service"
+
+    addon = ServiceState(
+        app_id="vplc", category="addon",
+        module="nodi_edge_addon.virtual_plc", enabled=False)
+    assert addon.svc_name == "ne-addon-vplc"
+
+
+# Managed Unit Scan
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _make_supervisor():
+    app = SupervisorApp.__new__(SupervisorApp)
+    app._logger = MagicMock()
+    app._services = {}
+    app._services_snap = ()
+    app._lock = threading.Lock()
+    app._unit_files = {}
+    app._services_dirty = True
+    app._service_count = 0
+    app._active_count = 0
+    app._published_tags = {}
+    app._fsm_progress_ts = 0.0
+    return app
+
+
+def test_scan_managed_units_filters_prefix(tmp_path, monkeypatch):
+    import nodi_edge_apps.supervisor.core as core
+    monkeypatch.setattr(core, "_SYSTEMD_DIR", tmp_path)
+    (tmp_path / "ne-interface-mtc-01.service").write_text("")
+    (tmp_path / "ne-addon-vplc.service").write_text("")
+    (tmp_path / "ne-supervisor.service").write_text("")
+    (tmp_path / "ssh.service").write_text("")
+
+    units = _make_supervisor()._scan_managed_units()
+    assert set(units) == {"ne-interface-mtc-01", "ne-addon-vplc"}
+    assert units["ne-addon-vplc"] == tmp_path / "ne-addon-vplc.service"
+
+
+def test_remove_orphan_units(tmp_path, monkeypatch):
+    import nodi_edge_apps.supervisor.core as core
+    monkeypatch.setattr(core, "_SYSTEMD_DIR", tmp_path)
+    (tmp_path / "ne-interface-mtc-01.service").write_text("")
+    (tmp_path / "ne-interface-stale.service").write_text("")
+
+    app = _make_supervisor()
+    app._services["mtc-01"] = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client", enabled=True)
+    app._update_services_snap()
+    app._unit_files = app._scan_managed_units()
+    stale = tmp_path / "ne-interface-stale.service"
+
+    # Orphan is stopped (unit file still present) before it is unlinked
+    app._systemctl = MagicMock(side_effect=lambda *args: stale.exists())
+    assert app._remove_orphan_units() is True
+    app._systemctl.assert_called_once_with("stop", "ne-interface-stale")
+    assert (tmp_path / "ne-interface-mtc-01.service").exists()
+    assert not stale.exists()
+    assert set(app._unit_files) == {"ne-interface-mtc-01"}
+
+    # Nothing orphaned: no systemctl call
+    app._systemctl.reset_mock()
+    assert app._remove_orphan_units() is False
+    app._systemctl.assert_not_called()
+
+
+def test_remove_orphan_units_keeps_files_when_stop_fails(tmp_path, monkeypatch):
+    import nodi_edge_apps.supervisor.core as core
+    monkeypatch.setattr(core, "_SYSTEMD_DIR", tmp_path)
+    (tmp_path / "ne-addon-old.service").write_text("")
+
+    app = _make_supervisor()
+    app._unit_files = app._scan_managed_units()
+    app._systemctl = MagicMock(return_value=False)
+
+    assert app._remove_orphan_units() is False
+    assert (tmp_path / "ne-addon-old.service").exists()
+    assert set(app._unit_files) == {"ne-addon-old"}
+
+
+def test_create_service_unit_skips_identical_content(tmp_path, monkeypatch):
+    import nodi_edge_apps.supervisor.core as core
+    monkeypatch.setattr(core, "_SYSTEMD_DIR", tmp_path)
+
+    app = _make_supervisor()
+    state = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client", enabled=True)
+
+    # First write creates the unit; a repeat is a no-op (no reload needed)
+    assert app._create_service_unit(state) is True
+    mtime = state.svc_path.stat().st_mtime_ns
+    assert app._create_service_unit(state) is False
+    assert state.svc_path.stat().st_mtime_ns == mtime
+
+    # Changed content is rewritten
+    state.module = "nodi_edge_interface.other"
+    assert app._create_service_unit(state) is True
+
+
+
+# Status Publishing
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_publish_status_skips_services_json_when_clean():
+    app = _make_supervisor()
+    app._databus = MagicMock()
+    app._fsm = MagicMock(current_state=None)
+    app._app_statistics = AppStatistics()
+    app._services["mtc-01"] = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client", enabled=True, active=True)
+    app._update_services_snap()
+
+    app._publish_status()
+    first = app._databus.set_tags.call_args[0][0]
+    assert "supervisor/_meta/services" in first
+    assert first["supervisor/_meta/active_count"] == 1
+
+    # Steady state: nothing changed, nothing published
+    app._databus.reset_mock()
+    app._publish_status()
+    app._databus.set_tags.assert_not_called()
+    app._databus.commit.assert_not_called()
+
+    # Dirty flag with identical content still publishes nothing
+    app._services_dirty = True
+    app._publish_status()
+    app._databus.set_tags.assert_not_called()
+
+    # Only the changed tags are sent
+    app._set_active(app._services["mtc-01"], False)
+    app._publish_status()
+    changed = app._databus.set_tags.call_args[0][0]
+    assert set(changed) == {"supervisor/_meta/services",
+                            "supervisor/_meta/active_count"}
+    assert changed["supervisor/_meta/active_count"] == 0
+
+
+# Command Dispatch
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_on_command_tag_dispatches_by_suffix():
+    app = _make_supervisor()
+    handler = MagicMock()
+    app._cmd_handlers = {"restart": handler}
+
+    app._on_command_tag("supervisor/_cmd/restart",
+                        MagicMock(v='{"app_id": "mtc-01"}'))
+    handler.assert_called_once_with({"app_id": "mtc-01"})
+
+    handler.reset_mock()
+    app._on_command_tag("supervisor/_cmd/restart/extra", MagicMock(v="{}"))
+    handler.assert_called_once_with({})
+
+    handler.reset_mock()
+    app._on_command_tag("supervisor/_meta/restart", MagicMock(v="{}"))
+    app._on_command_tag("supervisor/_cmd/unknown", MagicMock(v="{}"))
+    handler.assert_not_called()
+
+
+# Services Snapshot
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_services_snapshot_tracks_inserts_and_removals():
+    app = _make_supervisor()
+    for app_id in ("mtc-01", "mtc-02"):
+        app._services[app_id] = ServiceState(
+            app_id=app_id, category="interface",
+            module="nodi_edge_interface.modbus_tcp_client", enabled=True,
+            active=app_id == "mtc-01")
+    app._update_services_snap()
+    assert [s.app_id for s in app._services_snap] == ["mtc-01", "mtc-02"]
+    assert app._count_active() == 1
+
+    app._services.pop("mtc-01")
+    app._update_services_snap()
+    assert list(app._get_service_list()) == ["mtc-02"]
+    assert app._count_active() == 0
+
+
+# Healthcheck / sd_notify
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_healthcheck_observes_without_restarting():
+    app = _make_supervisor()
+    app._services["mtc-01"] = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client",
+        enabled=True, active=True, running=True)
+    app._update_services_snap()
+    app._services_dirty = False
+    app._get_active_states = MagicMock(
+        side_effect=lambda svcs: dict.fromkeys(svcs, False))
+    app._start_service = MagicMock()
+
+    app._healthcheck()
+    state = app._services["mtc-01"]
+    assert state.running is False
+    assert state.active is True
+    assert app._services_dirty is True
+    app._start_service.assert_not_called()
+
+
+def test_sd_notify_without_socket(monkeypatch):
+    monkeypatch.delenv("NOTIFY_SOCKET", raising=False)
+    assert _sd_notify("READY=1") is False
+
+
+def test_sd_notify_sends_datagram(tmp_path, monkeypatch):
+    path = str(tmp_path / "notify.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    server.bind(path)
+    try:
+        monkeypatch.setenv("NOTIFY_SOCKET", path)
+        assert _sd_notify("WATCHDOG=1") is True
+        assert server.recv(64) == b"WATCHDOG=1"
+    finally:
+        server.close()
+
+
+def test_ready_sent_at_prepare_not_after_starting_units(tmp_path, monkeypatch):
+    import nodi_edge_apps.supervisor.core as core
+    from nodi_edge_apps.supervisor.core import SupervisorConfig
+
+    notified = []
+    monkeypatch.setattr(core, "_sd_notify", notified.append)
+    monkeypatch.setattr(core.os, "geteuid", lambda: 0)
+    monkeypatch.setattr(core, "EdgeDB", MagicMock())
+
+    app = _make_supervisor()
+    app._sv_conf = SupervisorConfig(license_dir=str(tmp_path / "lic"),
+                                    pubkey_file=str(tmp_path / "missing.pem"))
+    app.on_prepare()
+    assert notified == ["READY=1"]
+
+    # on_connect starts units (their jobs wait on the supervisor's own start job)
+    app._databus = MagicMock()
+    app._load_registry = MagicMock()
+    app._sync_conns_initial = MagicMock()
+    app._start_enabled_services = MagicMock()
+    app.on_connect()
+    assert notified == ["READY=1"]
+
+
+# Batched systemctl
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_start_enabled_services_batches_units():
+    app = _make_supervisor()
+    for app_id, enabled in (("mtc-01", True), ("mtc-02", True), ("mtc-03", False)):
+        app._services[app_id] = ServiceState(
+            app_id=app_id, category="interface",
+            module="nodi_edge_interface.modbus_tcp_client", enabled=enabled)
+    app._update_services_snap()
+    app._create_service_unit = MagicMock(return_value=False)
+    app._systemctl = MagicMock(return_value=True)
+
+    app._start_enabled_services()
+    app._systemctl.assert_called_once_with(
+        "start", app._get_service_name("mtc-01", "interface"),
+        app._get_service_name("mtc-02", "interface"))
+    assert [s.active for s in app._services_snap] == [True, True, False]
+
+    app._systemctl.reset_mock()
+    app._stop_all_services()
+    assert app._systemctl.call_count == 1
+    assert app._count_active() == 0
+
+
+def test_start_enabled_services_falls_back_per_unit():
+    app = _make_supervisor()
+    for app_id in ("mtc-01", "mtc-02"):
+        app._services[app_id] = ServiceState(
+            app_id=app_id, category="interface",
+            module="nodi_edge_interface.modbus_tcp_client", enabled=True)
+    app._update_services_snap()
+    app._create_service_unit = MagicMock(return_value=False)
+    app._systemctl = MagicMock(return_value=False)
+    app._start_service = MagicMock(side_effect=lambda app_id, _: app_id == "mtc-02")
+    app._ping_watchdog = MagicMock()
+
+    app._start_enabled_services()
+    assert [s.active for s in app._services_snap] == [False, True]
+    # Slow per-unit starts keep the watchdog fed without touching FSM progress
+    assert app._ping_watchdog.call_count == 2
+    assert app._fsm_progress_ts == 0.0
+
+
+def test_get_active_states_parses_batched_output():
+    app = _make_supervisor()
+    result = MagicMock(stdout="active\nfailed\n")
+    with patch("subprocess.run", return_value=result) as run:
+        states = app._get_active_states(["ne-intf-a", "ne-intf-b", "ne-intf-c"])
+    run.assert_called_once()
+    assert run.call_args[0][0] == ["systemctl", "is-active",
+                                   "ne-intf-a", "ne-intf-b", "ne-intf-c"]
+    assert states == {"ne-intf-a": True, "ne-intf-b": False, "ne-intf-c": False}
+
+
+def test_restart_managed_service_single_call():
+    app = _make_supervisor()
+    app._services["mtc-01"] = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client", enabled=True)
+    app._systemctl = MagicMock(return_value=True)
+
+    app._restart_managed_service("mtc-01")
+    app._systemctl.assert_called_once_with(
+        "restart", app._get_service_name("mtc-01", "interface"))
+    assert app._services["mtc-01"].active is True
+
+
+def test_check_license_expiry_batches_db_writes():
+    app = _make_supervisor()
+    app._license_mgr = MagicMock()
+    app._db = MagicMock()
+    app._db.select_expired_apps.return_value = ["vplc", "logger"]
+    app._teardown_addon = MagicMock()
+    app._daemon_reload = MagicMock()
+    app._publish_event = MagicMock()
+
+    app._check_license_expiry()
+
+    assert app._teardown_addon.call_count == 2
+    app._daemon_reload.assert_called_once_with()
+    app._db.update_app_licenses_many.assert_called_once_with(
+        [("vplc", None, None, False), ("logger", None, None, False)])
+    app._db.update_app_license.assert_not_called()
+    assert app._license_mgr.remove_cached_token.call_count == 2
+
+
+def test_ensure_addon_registry_registers_only_missing(mem_db):
+    from nodi_edge.db import ADDON_MODULES, EdgeDB
+
+    app = _make_supervisor()
+    app._db = EdgeDB.__new__(EdgeDB)
+    app._db._conn = mem_db
+
+    first_id = next(iter(ADDON_MODULES))
+    app._db.upsert_app(first_id, "addon", ADDON_MODULES[first_id], enabled=True)
+
+    app._ensure_addon_registry()
+    assert app._db.select_apps_in(ADDON_MODULES) == set(ADDON_MODULES)
+    # Existing registration left untouched
+    assert app._db.select_app_enabled(first_id) is True
+
+
+def test_on_manage_throttles_healthcheck(monkeypatch):
+    import nodi_edge_apps.supervisor.core as core
+    from nodi_edge_apps.supervisor.core import SupervisorConfig
+
+    app = _make_supervisor()
+    app._sv_conf = SupervisorConfig(healthcheck_interval_s=30.0)
+    app._last_healthcheck_ts = 0.0
+    app._healthcheck = MagicMock()
+    app._publish_status = MagicMock()
+
+    clock = iter([100.0, 110.0, 131.0])
+    monkeypatch.setattr(core.time, "monotonic", lambda: next(clock))
+    for _ in range(3):
+        app.on_manage()
+
+    assert app._healthcheck.call_count == 2
+    assert app._publish_status.call_count == 3
+
+
+def test_on_manage_feeds_watchdog_only_while_fsm_progresses(monkeypatch):
+    import nodi_edge_apps.supervisor.core as core
+    from nodi_edge_apps.supervisor.core import SupervisorConfig
+
+    notified = []
+    monkeypatch.setattr(core, "_sd_notify", notified.append)
+    app = _make_supervisor()
+    app._sv_conf = SupervisorConfig(healthcheck_interval_s=1e9, watchdog_stall_s=45.0)
+    app._last_healthcheck_ts = 0.0
+    app._publish_status = MagicMock()
+
+    app._fsm_progress_ts = 100.0
+    monkeypatch.setattr(core.time, "monotonic", lambda: 140.0)
+    app.on_manage()
+    assert notified == ["WATCHDOG=1"]
+
+    # Main-thread manage loop alive, FSM thread stuck
+    monkeypatch.setattr(core.time, "monotonic", lambda: 150.0)
+    app.on_manage()
+    assert notified == ["WATCHDOG=1"]
+    assert app._publish_status.call_count == 2
+
+
+def test_set_active_keeps_active_count_in_step():
+    app = _make_supervisor()
+    state = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client", enabled=True)
+    app._services["mtc-01"] = state
+    app._update_services_snap()
+    assert app._count_active() == 0
+
+    app._set_active(state, True)
+    app._set_active(state, True)
+    assert app._count_active() == 1
+    app._services_dirty = False
+    app._set_active(state, False)
+    assert app._count_active() == 0
+    assert app._services_dirty is True
+
+
+def test_set_active_false_clears_running():
+    app = _make_supervisor()
+    state = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client", enabled=True)
+    app._put_services([state])
+    app._set_active(state, True)
+    state.running = True
+
+    app._set_active(state, False)
+    assert state.running is False
+    assert app._get_service_list()["mtc-01"]["running"] is False
+
+
+def test_services_dict_is_copy_on_write():
+    app = _make_supervisor()
+    before = app._services
+    state = ServiceState(
+        app_id="mtc-01", category="interface",
+        module="nodi_edge_interface.modbus_tcp_client", enabled=True)
+    app._put_services([state])
+    assert app._services is not before
+    assert "mtc-01" not in before
+    assert app._services_snap == (state,)
+
+    during = app._services
+    app._pop_service("mtc-01")
+    assert "mtc-01" in during
+    assert app._services == {}
+    assert app._services_snap == ()